@@ -14,15 +14,21 @@ if _needs_reload:
     import importlib
 
     from .utilities import (
+        arrays as _util_arrays,
         data as _util_data,
         types as _util_types,
         nodes as _util_nodes,
         materials as _util_materials,
+        stats as _util_stats,
+        workers as _util_workers,
     )
 
+    importlib.reload(_util_arrays)
     importlib.reload(_util_data)
     importlib.reload(_util_types)
     importlib.reload(_util_nodes)
+    importlib.reload(_util_stats)
+    importlib.reload(_util_workers)
 
     importlib.reload(colormaps)
     importlib.reload(_util_materials)
@@ -47,8 +47,9 @@ def unregister():
 if _needs_reload:
     import importlib
 
-    from . import utils, props, operators, ui
+    from . import tracing, utils, props, operators, ui
 
+    importlib.reload(tracing)
     importlib.reload(utils)
     importlib.reload(props)
     importlib.reload(operators)
@@ -6,7 +6,9 @@ from .utils import (
     Create_fieldline_geometry,
     On_material_colormap_change,
 )
+from .tracing import Trace_fieldlines, Trace_fieldlines_parallel
 
+from ..utilities.arrays import Load_array, Npz_keys
 from ..utilities.data import Encode_raw_data
 from ..utilities.materials import (
     CommonMaterialReverseColormap,
@@ -40,152 +42,121 @@ class Fieldlines_Create(bpy.types.Operator):
 
         material = Create_or_reset_fieldline_material(f"FieldlinesMaterial_{uuid_str}")
 
-        with np.load(props.npz_path) as npz_data:
-            fx_str, fy_str, fz_str = None, None, None
-            for k in npz_data.keys():
-                if len(k) >= 2 and k[-1].lower() == "x":
-                    fx_str = k
-                elif len(k) >= 2 and k[-1].lower() == "y":
-                    fy_str = k
-                elif len(k) >= 2 and k[-1].lower() == "z":
-                    fz_str = k
-
-            if fx_str is None or fy_str is None or fz_str is None:
-                self.report(
-                    {"ERROR"}, "Could not identify x, y, z keys in the .npz file"
-                )
-                return {"CANCELLED"}
-            fx_data = npz_data[fx_str]
-            fy_data = npz_data[fy_str]
-            fz_data = npz_data[fz_str]
-
-            # crop
-            zmin = props.crop_zmin
-            zmax = props.crop_zmax
-            ymin = props.crop_ymin
-            ymax = props.crop_ymax
-            xmin = props.crop_xmin
-            xmax = props.crop_xmax
-            self.report(
-                {"INFO"},
-                f"Cropping to Z[{zmin}:{zmax}] Y[{ymin}:{ymax}] X[{xmin}:{xmax}]",
-            )
-            try:
-                fx_data = fx_data[zmin:zmax, ymin:ymax, xmin:xmax]
-                fy_data = fy_data[zmin:zmax, ymin:ymax, xmin:xmax]
-                fz_data = fz_data[zmin:zmax, ymin:ymax, xmin:xmax]
-            except Exception as e:
-                self.report({"ERROR"}, f"Invalid crop indices: {e}")
-                return {"CANCELLED"}
-            if fx_data.size == 0 or fy_data.size == 0 or fz_data.size == 0:
-                self.report({"ERROR"}, "Cropped array is empty.")
-                return {"CANCELLED"}
-
-            sz, sy, sx = fx_data.shape
-            if fy_data.shape != (sz, sy, sx) or fz_data.shape != (sz, sy, sx):
-                self.report({"ERROR"}, "x, y, z data have different shapes")
-                return {"CANCELLED"}
+        fx_str, fy_str, fz_str = None, None, None
+        for k in Npz_keys(props.npz_path):
+            if len(k) >= 2 and k[-1].lower() == "x":
+                fx_str = k
+            elif len(k) >= 2 and k[-1].lower() == "y":
+                fy_str = k
+            elif len(k) >= 2 and k[-1].lower() == "z":
+                fz_str = k
+
+        if fx_str is None or fy_str is None or fz_str is None:
+            self.report({"ERROR"}, "Could not identify x, y, z keys in the .npz file")
+            return {"CANCELLED"}
+        fx_data = Load_array(props.npz_path, fx_str)
+        fy_data = Load_array(props.npz_path, fy_str)
+        fz_data = Load_array(props.npz_path, fz_str)
+
+        # crop
+        zmin = props.crop_zmin
+        zmax = props.crop_zmax
+        ymin = props.crop_ymin
+        ymax = props.crop_ymax
+        xmin = props.crop_xmin
+        xmax = props.crop_xmax
+        self.report(
+            {"INFO"},
+            f"Cropping to Z[{zmin}:{zmax}] Y[{ymin}:{ymax}] X[{xmin}:{xmax}]",
+        )
+        try:
+            # the components are memory-mapped when possible, so only the
+            # cropped region is read from disk
+            fx_data = np.ascontiguousarray(fx_data[zmin:zmax, ymin:ymax, xmin:xmax])
+            fy_data = np.ascontiguousarray(fy_data[zmin:zmax, ymin:ymax, xmin:xmax])
+            fz_data = np.ascontiguousarray(fz_data[zmin:zmax, ymin:ymax, xmin:xmax])
+        except Exception as e:
+            self.report({"ERROR"}, f"Invalid crop indices: {e}")
+            return {"CANCELLED"}
+        if fx_data.size == 0 or fy_data.size == 0 or fz_data.size == 0:
+            self.report({"ERROR"}, "Cropped array is empty.")
+            return {"CANCELLED"}
 
-            maxnorm = np.sqrt(np.max(fx_data**2 + fy_data**2 + fz_data**2))
-
-            if props.seed_points == "XY":
-                seed_xs = np.linspace(0.5, sx - 0.5, props.seed_resolution[0])
-                seed_ys = np.linspace(0.5, sy - 0.5, props.seed_resolution[1])
-                seed_xs, seed_ys = np.meshgrid(seed_xs, seed_ys, indexing="ij")
-                seed_zs = np.full(seed_xs.size, props.seed_displacement)
-            elif props.seed_points == "XZ":
-                seed_xs = np.linspace(0.5, sx - 0.5, props.seed_resolution[0])
-                seed_zs = np.linspace(0.5, sz - 0.5, props.seed_resolution[1])
-                seed_xs, seed_zs = np.meshgrid(seed_xs, seed_zs, indexing="ij")
-                seed_ys = np.full(seed_xs.size, props.seed_displacement)
-            elif props.seed_points == "YZ":
-                seed_ys = np.linspace(0.5, sy - 0.5, props.seed_resolution[0])
-                seed_zs = np.linspace(0.5, sz - 0.5, props.seed_resolution[1])
-                seed_ys, seed_zs = np.meshgrid(seed_ys, seed_zs, indexing="ij")
-                seed_xs = np.full(seed_ys.size, props.seed_displacement)
-            elif props.seed_points == "Custom":
-                self.report({"ERROR"}, "Custom seed points not implemented yet")
-                return {"CANCELLED"}
-            else:
-                self.report({"ERROR"}, "Invalid seed points option")
-                return {"CANCELLED"}
+        sz, sy, sx = fx_data.shape
+        if fy_data.shape != (sz, sy, sx) or fz_data.shape != (sz, sy, sx):
+            self.report({"ERROR"}, "x, y, z data have different shapes")
+            return {"CANCELLED"}
 
-            seed_points = np.vstack(
-                [seed_xs.ravel(), seed_ys.ravel(), seed_zs.ravel()]
-            ).T
+        maxnorm = np.sqrt(np.max(fx_data**2 + fy_data**2 + fz_data**2))
+
+        if props.seed_points == "XY":
+            seed_xs = np.linspace(0.5, sx - 0.5, props.seed_resolution[0])
+            seed_ys = np.linspace(0.5, sy - 0.5, props.seed_resolution[1])
+            seed_xs, seed_ys = np.meshgrid(seed_xs, seed_ys, indexing="ij")
+            seed_zs = np.full(seed_xs.size, props.seed_displacement)
+        elif props.seed_points == "XZ":
+            seed_xs = np.linspace(0.5, sx - 0.5, props.seed_resolution[0])
+            seed_zs = np.linspace(0.5, sz - 0.5, props.seed_resolution[1])
+            seed_xs, seed_zs = np.meshgrid(seed_xs, seed_zs, indexing="ij")
+            seed_ys = np.full(seed_xs.size, props.seed_displacement)
+        elif props.seed_points == "YZ":
+            seed_ys = np.linspace(0.5, sy - 0.5, props.seed_resolution[0])
+            seed_zs = np.linspace(0.5, sz - 0.5, props.seed_resolution[1])
+            seed_ys, seed_zs = np.meshgrid(seed_ys, seed_zs, indexing="ij")
+            seed_xs = np.full(seed_ys.size, props.seed_displacement)
+        elif props.seed_points == "Custom":
+            self.report({"ERROR"}, "Custom seed points not implemented yet")
+            return {"CANCELLED"}
+        else:
+            self.report({"ERROR"}, "Invalid seed points option")
+            return {"CANCELLED"}
 
-            nfieldlines = seed_points.shape[0]
+        seed_points = np.vstack([seed_xs.ravel(), seed_ys.ravel(), seed_zs.ravel()]).T
 
-            for i in range(nfieldlines):
-                xline, yline, zline, magline = (
-                    np.array([]),
-                    np.array([]),
-                    np.array([]),
-                    np.array([]),
-                )
-                ds = props.integration_step
-                MAXITER = props.integration_maxiter
-                if props.integration_direction == "Plus":
-                    signs = [+1.0]
-                elif props.integration_direction == "Minus":
-                    signs = [-1.0]
-                else:  # Both
-                    signs = [+1.0, -1.0]
-
-                for sign in signs:
-                    xl, yl, zl, magl = (
-                        np.array([]),
-                        np.array([]),
-                        np.array([]),
-                        np.array([]),
-                    )
-                    x, y, z = seed_points[i, :]
-                    iter = 0
-                    while iter < MAXITER and (
-                        0 <= x < sx - 1 and 0 <= y < sy - 1 and 0 <= z < sz - 1
-                    ):
-                        ix, iy, iz = int(x), int(y), int(z)
-                        fx = fx_data[iz, iy, ix]
-                        fy = fy_data[iz, iy, ix]
-                        fz = fz_data[iz, iy, ix]
-                        norm = (fx**2 + fy**2 + fz**2) ** 0.5
-                        if norm < 1e-8:
-                            break
-                        x += sign * (ds * fx) / norm
-                        y += sign * (ds * fy) / norm
-                        z += sign * (ds * fz) / norm
-                        xl = np.append(xl, x)
-                        yl = np.append(yl, y)
-                        zl = np.append(zl, z)
-                        magl = np.append(magl, norm)
-                        iter += 1
-
-                    if sign == +1:
-                        xline = np.append(xl[::-1], xline)
-                        yline = np.append(yl[::-1], yline)
-                        zline = np.append(zl[::-1], zline)
-                        magline = np.append(magl[::-1], magline)
-                    else:
-                        xline = np.append(xline, xl)
-                        yline = np.append(yline, yl)
-                        zline = np.append(zline, zl)
-                        magline = np.append(magline, magl)
-
-                Encode_raw_data(
-                    {
-                        "x": xline,
-                        "y": yline,
-                        "z": zline,
-                        "color": magline / maxnorm,
-                        "thickness": magline / maxnorm,
-                    },
-                    context,
-                    raw_collection,
-                    "Fieldline",
-                    f"{i}",
+        trace_kwargs = {
+            "step": props.integration_step,
+            "maxiter": props.integration_maxiter,
+            "direction": props.integration_direction,
+            "scheme": props.integration_scheme,
+            "tolerance": props.integration_tolerance,
+        }
+        if props.integration_workers > 1:
+            try:
+                xs, ys, zs, mags, line_ids = Trace_fieldlines_parallel(
+                    fx_data,
+                    fy_data,
+                    fz_data,
+                    seed_points,
+                    props.integration_workers,
+                    **trace_kwargs,
                 )
+            except Exception as e:
+                self.report({"ERROR"}, f"Parallel fieldline tracing failed: {e}")
+                return {"CANCELLED"}
+        else:
+            xs, ys, zs, mags, line_ids = Trace_fieldlines(
+                fx_data, fy_data, fz_data, seed_points, **trace_kwargs
+            )
 
-        mesh = Create_fieldline_geometry(context, raw_collection, material, uuid_str)
+        # all fieldlines are packed into a single raw mesh, and each point
+        # carries the index of its line as the curve group id
+        magnitudes = mags / maxnorm
+        raw_obj, _ = Encode_raw_data(
+            {
+                "x": xs,
+                "y": ys,
+                "z": zs,
+                "color": magnitudes,
+                "thickness": magnitudes,
+                "line_id": line_ids,
+            },
+            context,
+            raw_collection,
+            "Fieldlines",
+            uuid_str,
+        )
+
+        mesh = Create_fieldline_geometry(context, raw_obj, material, uuid_str)
         mesh.active_material = material
         mesh.scale = (0.01, 0.01, 0.01)
 
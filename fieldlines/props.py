@@ -34,6 +34,28 @@ class Fieldlines_Props(bpy.types.PropertyGroup):
         ],
         default="Both",
     )
+    integration_scheme: bpy.props.EnumProperty(
+        name="Integration scheme",
+        description="Fieldline integration scheme (the field is sampled trilinearly)",
+        items=[
+            ("Euler", "Euler", "Forward Euler (1st order)"),
+            ("RK2", "RK2", "Midpoint Runge-Kutta (2nd order)"),
+            ("RK4", "RK4", "Classic Runge-Kutta (4th order)"),
+            (
+                "RK45",
+                "RK45 (adaptive)",
+                "Dormand-Prince Runge-Kutta with adaptive step size",
+            ),
+        ],
+        default="Euler",
+    )
+    integration_tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        description="Maximum local error per step (in units of cells) for the adaptive scheme",
+        default=1e-3,
+        precision=6,
+        min=1e-9,
+    )
     integration_step: bpy.props.FloatProperty(
         name="Integration step",
         description="Integration step size (in units of cells)",
@@ -48,6 +70,13 @@ class Fieldlines_Props(bpy.types.PropertyGroup):
         min=1,
         max=100000,
     )
+    integration_workers: bpy.props.IntProperty(
+        name="Worker processes",
+        description="Number of processes used to trace the fieldlines (1 traces them in Blender itself)",
+        default=1,
+        min=1,
+        max=64,
+    )
     seed_points: bpy.props.EnumProperty(
         name="Seed points",
         description="Preset for seed points",
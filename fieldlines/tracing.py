@@ -0,0 +1,330 @@
+import os
+import tempfile
+
+import numpy as np
+
+from ..utilities.workers import Run_in_subprocesses
+
+
+def _inside(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray, shape: tuple[int, ...]
+) -> np.ndarray:
+    sz, sy, sx = shape
+    return (x >= 0) & (x < sx - 1) & (y >= 0) & (y < sy - 1) & (z >= 0) & (z < sz - 1)
+
+
+# Butcher tableaus: (stage coefficients, weights, lower-order weights for the
+# error estimate of adaptive schemes)
+_SCHEMES: dict[str, tuple[tuple, tuple, tuple | None]] = {
+    "Euler": ((), (1.0,), None),
+    "RK2": (((0.5,),), (0.0, 1.0), None),
+    "RK4": (
+        ((0.5,), (0.0, 0.5), (0.0, 0.0, 1.0)),
+        (1 / 6, 1 / 3, 1 / 3, 1 / 6),
+        None,
+    ),
+    "RK45": (
+        (
+            (1 / 5,),
+            (3 / 40, 9 / 40),
+            (44 / 45, -56 / 15, 32 / 9),
+            (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+            (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+            (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+        ),
+        (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0),
+        (
+            5179 / 57600,
+            0.0,
+            7571 / 16695,
+            393 / 640,
+            -92097 / 339200,
+            187 / 2100,
+            1 / 40,
+        ),
+    ),
+}
+
+
+def _sample_field(
+    fx: np.ndarray,
+    fy: np.ndarray,
+    fz: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Trilinearly interpolates the field at the given (clamped) positions.
+
+    Non-finite positions sample as NaN.
+    """
+    sz, sy, sx = fx.shape
+    ix = np.clip(np.floor(np.nan_to_num(x)), 0, max(sx - 2, 0)).astype(np.intp)
+    iy = np.clip(np.floor(np.nan_to_num(y)), 0, max(sy - 2, 0)).astype(np.intp)
+    iz = np.clip(np.floor(np.nan_to_num(z)), 0, max(sz - 2, 0)).astype(np.intp)
+    tx = np.clip(x - ix, 0.0, 1.0)
+    ty = np.clip(y - iy, 0.0, 1.0)
+    tz = np.clip(z - iz, 0.0, 1.0)
+    jx = np.minimum(ix + 1, sx - 1)
+    jy = np.minimum(iy + 1, sy - 1)
+    jz = np.minimum(iz + 1, sz - 1)
+
+    def _interp(f):
+        c00 = f[iz, iy, ix] * (1 - tx) + f[iz, iy, jx] * tx
+        c01 = f[iz, jy, ix] * (1 - tx) + f[iz, jy, jx] * tx
+        c10 = f[jz, iy, ix] * (1 - tx) + f[jz, iy, jx] * tx
+        c11 = f[jz, jy, ix] * (1 - tx) + f[jz, jy, jx] * tx
+        return (c00 * (1 - ty) + c01 * ty) * (1 - tz) + (c10 * (1 - ty) + c11 * ty) * tz
+
+    return _interp(fx), _interp(fy), _interp(fz)
+
+
+def _unit_field(
+    field: tuple[np.ndarray, np.ndarray, np.ndarray],
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the field direction (zero where the field vanishes) and magnitude."""
+    bx, by, bz = _sample_field(*field, x, y, z)
+    norm = np.sqrt(bx * bx + by * by + bz * bz)
+    inv = np.divide(1.0, norm, out=np.zeros_like(norm), where=norm >= 1e-8)
+    return bx * inv, by * inv, bz * inv, norm
+
+
+def _rk_step(
+    field: tuple[np.ndarray, np.ndarray, np.ndarray],
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    k0: tuple[np.ndarray, np.ndarray, np.ndarray],
+    h: np.ndarray,
+    scheme: tuple[tuple, tuple, tuple | None],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray | None]:
+    """Takes one explicit Runge-Kutta step of (signed) size ``h``.
+
+    Returns the displacement and, for embedded schemes, the local error estimate.
+    """
+    stages, weights, weights_low = scheme
+    ks = [k0]
+    for row in stages:
+        xs = x + h * sum(c * k[0] for c, k in zip(row, ks) if c != 0.0)
+        ys = y + h * sum(c * k[1] for c, k in zip(row, ks) if c != 0.0)
+        zs = z + h * sum(c * k[2] for c, k in zip(row, ks) if c != 0.0)
+        ks.append(_unit_field(field, xs, ys, zs)[:3])
+    if len(weights) > len(ks):
+        # the last stage of an embedded pair is only needed for the error
+        xn, yn, zn = (
+            x + h * sum(w * k[0] for w, k in zip(weights, ks)),
+            y + h * sum(w * k[1] for w, k in zip(weights, ks)),
+            z + h * sum(w * k[2] for w, k in zip(weights, ks)),
+        )
+        ks.append(_unit_field(field, xn, yn, zn)[:3])
+
+    dx = h * sum(w * k[0] for w, k in zip(weights, ks) if w != 0.0)
+    dy = h * sum(w * k[1] for w, k in zip(weights, ks) if w != 0.0)
+    dz = h * sum(w * k[2] for w, k in zip(weights, ks) if w != 0.0)
+    if weights_low is None:
+        return dx, dy, dz, None
+
+    dw = [w - wl for w, wl in zip(weights, weights_low)]
+    ex = np.abs(h * sum(d * k[0] for d, k in zip(dw, ks) if d != 0.0))
+    ey = np.abs(h * sum(d * k[1] for d, k in zip(dw, ks) if d != 0.0))
+    ez = np.abs(h * sum(d * k[2] for d, k in zip(dw, ks) if d != 0.0))
+    return dx, dy, dz, np.maximum(np.maximum(ex, ey), ez)
+
+
+def _trace_direction(
+    fx: np.ndarray,
+    fy: np.ndarray,
+    fz: np.ndarray,
+    seeds: np.ndarray,
+    sign: float,
+    step: float,
+    maxiter: int,
+    scheme: str,
+    tolerance: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Advances all seeds together along ``sign * F / |F|``.
+
+    Returns the (maxiter, nseeds) buffers with the visited x, y, z and the field
+    magnitude at the start of each step, plus the number of steps per seed.
+    """
+    field = (fx, fy, fz)
+    tableau = _SCHEMES[scheme]
+    adaptive = tableau[2] is not None
+    hmin, hmax = step * 1e-2, step * 1e1
+
+    nseeds = seeds.shape[0]
+    x = seeds[:, 0].astype(np.float64)
+    y = seeds[:, 1].astype(np.float64)
+    z = seeds[:, 2].astype(np.float64)
+    h = np.full(nseeds, step, dtype=np.float64)
+
+    xbuf = np.empty((maxiter, nseeds), dtype=np.float32)
+    ybuf = np.empty((maxiter, nseeds), dtype=np.float32)
+    zbuf = np.empty((maxiter, nseeds), dtype=np.float32)
+    magbuf = np.empty((maxiter, nseeds), dtype=np.float32)
+    counts = np.zeros(nseeds, dtype=np.int64)
+
+    active = _inside(x, y, z, fx.shape) & (maxiter > 0)
+    while (idx := np.flatnonzero(active)).size > 0:
+        xi, yi, zi = x[idx], y[idx], z[idx]
+        ux, uy, uz, norm = _unit_field(field, xi, yi, zi)
+
+        moving = norm >= 1e-8
+        active[idx[~moving]] = False
+        idx, xi, yi, zi = idx[moving], xi[moving], yi[moving], zi[moving]
+        ux, uy, uz, norm = ux[moving], uy[moving], uz[moving], norm[moving]
+
+        hi = h[idx]
+        dx, dy, dz, err = _rk_step(field, xi, yi, zi, (ux, uy, uz), sign * hi, tableau)
+        # a stage that sampled a masked (NaN) cell ends the line there
+        finite = np.isfinite(dx) & np.isfinite(dy) & np.isfinite(dz)
+        if err is not None:
+            finite &= np.isfinite(err)
+            err = err[finite]
+        active[idx[~finite]] = False
+        idx, xi, yi, zi, hi = (
+            idx[finite],
+            xi[finite],
+            yi[finite],
+            zi[finite],
+            hi[finite],
+        )
+        dx, dy, dz, norm = dx[finite], dy[finite], dz[finite], norm[finite]
+        if adaptive and err is not None:
+            # accept steps within tolerance (or already at the smallest size),
+            # and adapt the step size of every seed for its next attempt
+            accept = (err <= tolerance) | (hi <= hmin)
+            factor = 0.9 * (tolerance / np.maximum(err, 1e-300)) ** 0.2
+            h[idx] = np.clip(hi * np.clip(factor, 0.2, 5.0), hmin, hmax)
+            idx, xi, yi, zi = idx[accept], xi[accept], yi[accept], zi[accept]
+            dx, dy, dz, norm = dx[accept], dy[accept], dz[accept], norm[accept]
+
+        x[idx] = xi + dx
+        y[idx] = yi + dy
+        z[idx] = zi + dz
+        row = counts[idx]
+        xbuf[row, idx] = x[idx]
+        ybuf[row, idx] = y[idx]
+        zbuf[row, idx] = z[idx]
+        magbuf[row, idx] = norm
+        counts[idx] += 1
+        active[idx] = _inside(x[idx], y[idx], z[idx], fx.shape) & (
+            counts[idx] < maxiter
+        )
+
+    return xbuf, ybuf, zbuf, magbuf, counts
+
+
+def Trace_fieldlines(
+    fx: np.ndarray,
+    fy: np.ndarray,
+    fz: np.ndarray,
+    seeds: np.ndarray,
+    step: float = 0.5,
+    maxiter: int = 1000,
+    direction: str = "Both",
+    scheme: str = "Euler",
+    tolerance: float = 1e-3,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Integrates fieldlines from every seed at once.
+
+    ``fx``, ``fy``, ``fz`` are (Z, Y, X) arrays, and ``seeds`` is an (N, 3)
+    array of x, y, z positions in cells. The field is sampled trilinearly and
+    integrated with ``scheme`` (Euler, RK2, RK4, or the adaptive RK45, whose
+    step size starts at ``step`` and is controlled by ``tolerance`` in cells).
+    Returns the packed x, y, z, field magnitude and line index of every point;
+    each line is ordered from its backward end to its forward end.
+    """
+    nseeds = seeds.shape[0]
+    empty = np.zeros((0, nseeds), dtype=np.float32)
+    no_steps = np.zeros(nseeds, dtype=np.int64)
+
+    if direction in ("Both", "Plus"):
+        plus = _trace_direction(
+            fx, fy, fz, seeds, +1.0, step, maxiter, scheme, tolerance
+        )
+    else:
+        plus = (empty, empty, empty, empty, no_steps)
+    if direction in ("Both", "Minus"):
+        minus = _trace_direction(
+            fx, fy, fz, seeds, -1.0, step, maxiter, scheme, tolerance
+        )
+    else:
+        minus = (empty, empty, empty, empty, no_steps)
+
+    nplus, nminus = plus[-1], minus[-1]
+    lengths = nplus + nminus
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    npoints = int(lengths.sum())
+
+    out = [np.empty(npoints, dtype=np.float32) for _ in range(4)]
+
+    # forward steps are stored reversed, followed by the backward steps
+    it, iseed = np.nonzero(np.arange(plus[0].shape[0])[:, None] < nplus[None, :])
+    dest = offsets[iseed] + nplus[iseed] - 1 - it
+    for o, buf in zip(out, plus[:4]):
+        o[dest] = buf[it, iseed]
+
+    it, iseed = np.nonzero(np.arange(minus[0].shape[0])[:, None] < nminus[None, :])
+    dest = offsets[iseed] + nplus[iseed] + it
+    for o, buf in zip(out, minus[:4]):
+        o[dest] = buf[it, iseed]
+
+    line_ids = np.repeat(np.arange(nseeds, dtype=np.int32), lengths)
+    return out[0], out[1], out[2], out[3], line_ids
+
+
+def Trace_fieldlines_mmap(
+    field_path: str, seeds: np.ndarray, **kwargs
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Worker entry point: traces through a memory-mapped (3, Z, Y, X) field."""
+    field = np.load(field_path, mmap_mode="r")
+    return Trace_fieldlines(field[0], field[1], field[2], seeds, **kwargs)
+
+
+def Trace_fieldlines_parallel(
+    fx: np.ndarray,
+    fy: np.ndarray,
+    fz: np.ndarray,
+    seeds: np.ndarray,
+    workers: int,
+    **kwargs,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Same as ``Trace_fieldlines``, with the seeds split across worker processes.
+
+    The field components are written once to a temporary ``.npy`` file which
+    every worker memory-maps, and the per-chunk results are merged in seed
+    order, so the output is identical to the serial one.
+    """
+    chunks = [c for c in np.array_split(seeds, max(1, workers)) if c.shape[0] > 0]
+    if len(chunks) <= 1:
+        return Trace_fieldlines(fx, fy, fz, seeds, **kwargs)
+
+    with tempfile.TemporaryDirectory(prefix="blend_et_") as tmpdir:
+        field_path = os.path.join(tmpdir, "field.npy")
+        field = np.lib.format.open_memmap(
+            field_path,
+            mode="w+",
+            dtype=np.result_type(fx, fy, fz),
+            shape=(3, *fx.shape),
+        )
+        field[0], field[1], field[2] = fx, fy, fz
+        field.flush()
+        del field
+
+        results = Run_in_subprocesses(
+            "fieldlines.tracing",
+            "Trace_fieldlines_mmap",
+            [dict(field_path=field_path, seeds=c, **kwargs) for c in chunks],
+            max_workers=len(chunks),
+        )
+
+    offsets = np.cumsum([0] + [c.shape[0] for c in chunks[:-1]])
+    merged = [np.concatenate([r[k] for r in results]) for k in range(4)]
+    line_ids = np.concatenate(
+        [r[4] + np.int32(offset) for r, offset in zip(results, offsets)]
+    )
+    return merged[0], merged[1], merged[2], merged[3], line_ids
@@ -74,8 +74,12 @@ class BLENDET_PT_fieldlines_3dv(bpy.types.Panel):
         box = layout.box()
         box.label(text="Integration settings", icon="MOD_CURVE")
         box.row().prop(props, "integration_direction")
+        box.row().prop(props, "integration_scheme")
         box.row().prop(props, "integration_step")
+        if props.integration_scheme == "RK45":
+            box.row().prop(props, "integration_tolerance")
         box.row().prop(props, "integration_maxiter")
+        box.row().prop(props, "integration_workers")
 
         box = layout.box()
         box.label(text="Seed points settings", icon="PARTICLES")
@@ -14,7 +14,7 @@ from ..utilities.materials import (
 
 def Create_fieldline_geometry(
     context: bpy.types.Context,
-    raw_collection: bpy.types.Collection | None = None,
+    raw_object: bpy.types.Object | None = None,
     material: bpy.types.Material | None = None,
     uuid_str: str = "",
 ) -> bpy.types.Object:
@@ -32,11 +32,6 @@ def Create_fieldline_geometry(
     obj.modifiers.new(name="GeometryNodes", type="NODES")
     obj.modifiers["GeometryNodes"].node_group = nt
 
-    def _modify_capture_attribute(n):
-        n.capture_items.clear()
-        n.capture_items.new("FLOAT", "Index")
-        n.capture_items["Index"].data_type = "INT"
-
     def _modify_modulate_switch(n):
         n.inputs[1].default_value = 1.0
 
@@ -44,30 +39,9 @@ def Create_fieldline_geometry(
         node_kwargs=[
             [
                 {
-                    "type_id": "GeometryNodeCollectionInfo",
+                    "type_id": "GeometryNodeObjectInfo",
                     "label": "Raw Fieldlines",
-                    "input_defaults": {
-                        "Separate Children": True,
-                        0: raw_collection,
-                    },
-                },
-                {
-                    "type_id": "GeometryNodeInputIndex",
-                    "label": "Fieldline Index",
-                },
-            ],
-            [
-                {
-                    "type_id": "GeometryNodeCaptureAttribute",
-                    "label": "Capture Fieldline Index",
-                    "domain": "INSTANCE",
-                    "extra": _modify_capture_attribute,
-                }
-            ],
-            [
-                {
-                    "type_id": "GeometryNodeRealizeInstances",
-                    "label": "Realize Fieldlines",
+                    "input_defaults": {0: raw_object},
                 },
                 {
                     "type_id": "GeometryNodeInputIndex",
@@ -82,6 +56,14 @@ def Create_fieldline_geometry(
                     "input_defaults": {0: xyzt},
                 }
                 for xyzt in ["x", "y", "z", "thickness", "color"]
+            ]
+            + [
+                {
+                    "type_id": "GeometryNodeInputNamedAttribute",
+                    "label": "Attr LINE_ID",
+                    "data_type": "INT",
+                    "input_defaults": {0: "line_id"},
+                }
             ],
             [
                 {
@@ -184,15 +166,12 @@ def Create_fieldline_geometry(
             },
         ],
         node_links=[
-            (("RawFieldlines", "Instances"), ("CaptureFieldlineIndex", "Geometry")),
-            (("FieldlineIndex", "Index"), ("CaptureFieldlineIndex", "Index")),
-            (("CaptureFieldlineIndex", "Geometry"), ("RealizeFieldlines", "Geometry")),
-            (("RealizeFieldlines", "Geometry"), ("PointPositions", "Geometry")),
-            (("RealizeFieldlines", "Geometry"), ("SampleX", "Geometry")),
-            (("RealizeFieldlines", "Geometry"), ("SampleY", "Geometry")),
-            (("RealizeFieldlines", "Geometry"), ("SampleZ", "Geometry")),
-            (("RealizeFieldlines", "Geometry"), ("SampleTHICKNESS", "Geometry")),
-            (("RealizeFieldlines", "Geometry"), ("SampleCOLOR", "Geometry")),
+            (("RawFieldlines", "Geometry"), ("PointPositions", "Geometry")),
+            (("RawFieldlines", "Geometry"), ("SampleX", "Geometry")),
+            (("RawFieldlines", "Geometry"), ("SampleY", "Geometry")),
+            (("RawFieldlines", "Geometry"), ("SampleZ", "Geometry")),
+            (("RawFieldlines", "Geometry"), ("SampleTHICKNESS", "Geometry")),
+            (("RawFieldlines", "Geometry"), ("SampleCOLOR", "Geometry")),
             (("AttrX", "Attribute"), ("SampleX", "Value")),
             (("AttrY", "Attribute"), ("SampleY", "Value")),
             (("AttrZ", "Attribute"), ("SampleZ", "Value")),
@@ -212,7 +191,7 @@ def Create_fieldline_geometry(
             (("CombineXYZ", "Vector"), ("PointPositions", "Position")),
             (("PointPositions", "Geometry"), ("ConvertToPoints", "Mesh")),
             (("ConvertToPoints", "Points"), ("PointsToCurves", "Points")),
-            (("CaptureFieldlineIndex", "Index"), ("PointsToCurves", "Curve Group ID")),
+            (("AttrLINE_ID", "Attribute"), ("PointsToCurves", "Curve Group ID")),
             (("PointsToCurves", "Curves"), ("StoreColor", "Geometry")),
             (("StoreColor", "Geometry"), ("CurvesToMesh", "Curve")),
             (("GroupInput", "Resolution"), ("CircleProfile", "Resolution")),
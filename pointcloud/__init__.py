@@ -47,8 +47,11 @@ def unregister():
 if _needs_reload:
     import importlib
 
-    from . import utils, props, operators, ui
+    from . import readers, sampling, spatial, utils, props, operators, ui
 
+    importlib.reload(readers)
+    importlib.reload(sampling)
+    importlib.reload(spatial)
     importlib.reload(utils)
     importlib.reload(props)
     importlib.reload(operators)
@@ -1,5 +1,16 @@
 import bpy
 
+import os
+
+from .readers import Pointcloud_chunks, Read_pointcloud
+from .sampling import Reduce_points
+from .spatial import (
+    Density_grid,
+    Grid_frame,
+    Octree_levels,
+    Smoothing_pad,
+    Spatial_order,
+)
 from .utils import (
     Create_pointcloud_mesh,
     Create_or_reset_pointcloud_volume_material,
@@ -11,7 +22,63 @@ from ..utilities.data import Encode_raw_data
 from ..utilities.materials import (
     CommonMaterialReverseColormap,
 )
+from ..utilities.stats import Histogram_statistics
 from ..utilities.types import OperatorReturnItems
+from ..volume.cache import CACHE_DIRNAME, Cache_key, Load_cached, Store_cached
+from ..volume.conversion import Convert_array_to_vdb
+
+
+def _density_grid_vdb(props, path: str, data: dict) -> tuple[str, list[float], float]:
+    """Bins the points into a density grid stored as a .vdb in the volume cache
+    (or reuses a previous one); returns its path, the corner of the grid and
+    the voxel size."""
+    path = os.path.normpath(path)
+    if os.path.isdir(path):
+        sources = [
+            os.path.join(path, n)
+            for n in sorted(os.listdir(path))
+            if n.lower().endswith(".npy")
+        ]
+    else:
+        sources = [path]
+    weight = props.density_weight.strip()
+    key = Cache_key(
+        sources,
+        kind="pointcloud_density",
+        columns=props.pointcloud_columns,
+        reduction=(
+            props.reduction_mode,
+            props.reduction_budget,
+            props.reduction_weight,
+        ),
+        resolution=props.density_resolution,
+        weight=weight,
+        smoothing=props.density_smoothing,
+    )
+    cache_dir = os.path.join(os.path.dirname(path), CACHE_DIRNAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(path))[0]
+    vdb_path = os.path.join(cache_dir, f"{name}_density_{key}.vdb")
+    x, y, z = data["x"], data["y"], data["z"]
+    sigma = props.density_smoothing
+
+    if Load_cached(vdb_path) is not None:
+        lo, voxel, _ = Grid_frame(
+            x, y, z, props.density_resolution, Smoothing_pad(sigma)
+        )
+        return vdb_path, lo.tolist(), voxel
+
+    grid, lo, voxel = Density_grid(
+        x,
+        y,
+        z,
+        props.density_resolution,
+        weights=data[weight] if weight else None,
+        sigma=sigma,
+    )
+    conversion = Convert_array_to_vdb(grid, vdb_path, axis_order="XYZ")
+    Store_cached(vdb_path, Histogram_statistics(conversion.histogram))
+    return vdb_path, lo.tolist(), voxel
 
 
 class Pointcloud_Create(bpy.types.Operator):
@@ -32,36 +99,58 @@ class Pointcloud_Create(bpy.types.Operator):
 
         import numpy as np
 
-        data: dict[str, list[float] | np.ndarray] = {}
-        if pointcloud_path.lower().endswith(".npz"):
-            with np.load(pointcloud_path) as npz_data:
-                for k in npz_data.keys():
-                    data[k] = npz_data[k]
-        elif pointcloud_path.lower().endswith(".csv"):
-            skiprows = 0
-            cols = []
-            with open(pointcloud_path, "r") as f:
-                first_line = f.readline()
-                if not all(
-                    part.replace(".", "", 1)
-                    .replace("-", "", 1)
-                    .replace("e", "", 1)
-                    .isdigit()
-                    for part in first_line.split(",")
-                ):
-                    skiprows = 1
-                    cols = [c.strip() for c in first_line.replace("#", "").split(",")]
-            data_raw = np.loadtxt(pointcloud_path, delimiter=",", skiprows=skiprows)
-            if cols == []:
-                cols = [
-                    f"col_{i - 2}" if i >= 2 else "xyz"[i]
-                    for i in range(data_raw.shape[1])
-                ]
-            for i, col in enumerate(cols):
-                data[col] = data_raw[:, i]
-        else:
-            self.report({"ERROR"}, "Unsupported file format. Please use .npz or .csv")
+        pointcloud_path = bpy.path.abspath(pointcloud_path)
+        columns = [c.strip() for c in props.pointcloud_columns.split(",")]
+        columns = [c for c in columns if c]
+        mode = props.reduction_mode
+        weight = props.reduction_weight.strip()
+        if mode == "IMPORTANCE" and columns and weight not in columns:
+            columns.append(weight)
+        density_weight = props.density_weight.strip()
+        if props.density_grid and columns and density_weight not in ("", *columns):
+            columns.append(density_weight)
+        try:
+            if mode == "NONE":
+                data = Read_pointcloud(pointcloud_path, columns)
+            else:
+                data, total = Reduce_points(
+                    lambda: Pointcloud_chunks(pointcloud_path, columns),
+                    mode,
+                    props.reduction_budget,
+                    weight,
+                )
+        except (OSError, ValueError) as e:
+            self.report({"ERROR"}, f"Failed to read {pointcloud_path}: {e}")
             return {"CANCELLED"}
+        if not data or len(next(iter(data.values()))) == 0:
+            self.report({"ERROR"}, f"No points found in {pointcloud_path}")
+            return {"CANCELLED"}
+        if mode != "NONE":
+            kept = len(next(iter(data.values())))
+            self.report({"INFO"}, f"Kept {kept} of {total} points")
+        needs_xyz = props.point_order != "FILE" or props.build_lod or props.density_grid
+        if needs_xyz and not all(a in data for a in "xyz"):
+            self.report(
+                {"ERROR"}, "Spatial ordering, LOD and density grids need x, y and z"
+            )
+            return {"CANCELLED"}
+        if props.density_grid and density_weight and density_weight not in data:
+            self.report({"ERROR"}, f"Weight column '{density_weight}' not found")
+            return {"CANCELLED"}
+        if props.point_order != "FILE":
+            order = Spatial_order(data["x"], data["y"], data["z"], props.point_order)
+            data = {k: np.asarray(v)[order] for k, v in data.items()}
+        if props.build_lod:
+            data["lod_level"] = Octree_levels(data["x"], data["y"], data["z"])
+        if props.density_grid:
+            # built before any scene data, so a failure leaves nothing behind
+            try:
+                vdb_path, corner, voxel = _density_grid_vdb(
+                    props, pointcloud_path, data
+                )
+            except Exception as e:
+                self.report({"ERROR"}, f"Failed to build the density grid: {e}")
+                return {"CANCELLED"}
 
         props = scene.blend_et_pointcloud
         uuid_str = f"{props.uuid:04d}"
@@ -89,10 +178,30 @@ class Pointcloud_Create(bpy.types.Operator):
         )
 
         mesh = Create_pointcloud_mesh(
-            context, raw_obj, material_volume, material_mesh, uuid_str
+            context,
+            raw_obj,
+            material_volume,
+            material_mesh,
+            uuid_str,
+            use_lod=props.build_lod,
+            native_points=props.native_points,
         )
         mesh.active_material = material_volume
 
+        if props.density_grid:
+            vol_data = bpy.data.volumes.new(name=f"PointcloudDensity_{uuid_str}")
+            vol_data.filepath = vdb_path
+            vol_data.materials.append(material_volume)
+            vol_obj = bpy.data.objects.new(f"PointcloudDensity_{uuid_str}", vol_data)
+            (context.collection or scene.collection).objects.link(vol_obj)
+            # openvdb puts voxel centers on integer coordinates; the grid moves
+            # with the pointcloud object
+            vol_obj.parent = mesh
+            vol_obj.location = [c + 0.5 * voxel for c in corner]
+            vol_obj.scale = (voxel, voxel, voxel)
+            mesh.hide_viewport = True
+            mesh.hide_render = True
+
         return {"FINISHED"}
 
 
@@ -17,11 +17,120 @@ class Pointcloud_Props(bpy.types.PropertyGroup):
     )
 
     pointcloud_path: bpy.props.StringProperty(
-        name=".npz / .csv",
-        description="Path to a .npz or .csv file for pointcloud rendering",
+        name="Data",
+        description=(
+            "Path to a .npz, .csv, .parquet, .feather/.arrow or .h5/.hdf5 file, or "
+            "to a directory of <column>.npy files, for pointcloud rendering"
+        ),
         subtype="FILE_PATH",
     )
 
+    pointcloud_columns: bpy.props.StringProperty(
+        name="Columns",
+        description=(
+            "Comma-separated columns to load besides x, y and z "
+            "(empty loads every column)"
+        ),
+        default="",
+    )
+
+    reduction_mode: bpy.props.EnumProperty(
+        name="Reduction",
+        description="Reduce the points to a fixed budget while reading the file",
+        items=[
+            ("NONE", "None", "Import every point"),
+            ("RANDOM", "Random", "Uniformly random subset of the points"),
+            (
+                "VOXEL",
+                "Voxel grid",
+                "One point per cell of a regular grid, with averaged attributes",
+            ),
+            (
+                "IMPORTANCE",
+                "Importance",
+                "Random subset with probabilities proportional to a weight column",
+            ),
+        ],
+        default="NONE",
+    )
+
+    reduction_budget: bpy.props.IntProperty(
+        name="Budget",
+        description="Maximum number of points to import",
+        default=1_000_000,
+        min=1,
+    )
+
+    reduction_weight: bpy.props.StringProperty(
+        name="Weight column",
+        description="Column whose values weight the importance sampling",
+        default="",
+    )
+
+    point_order: bpy.props.EnumProperty(
+        name="Point order",
+        description=(
+            "Order in which the points are stored; sorting along a space-filling "
+            "curve keeps nearby points together, so strided downsampling stays "
+            "spatially uniform"
+        ),
+        items=[
+            ("FILE", "File", "Keep the order of the file"),
+            ("MORTON", "Morton", "Sort along a Z-order (Morton) curve"),
+            ("HILBERT", "Hilbert", "Sort along a Hilbert curve"),
+        ],
+        default="FILE",
+    )
+
+    density_grid: bpy.props.BoolProperty(
+        name="Precompute density grid",
+        description=(
+            "Bin the points into a density grid once on import and render it as a "
+            "cached .vdb volume, instead of rebuilding the volume from the points "
+            "on every update"
+        ),
+        default=False,
+    )
+
+    density_resolution: bpy.props.IntProperty(
+        name="Resolution",
+        description="Voxels along the longest side of the density grid",
+        default=256,
+        min=8,
+    )
+
+    density_weight: bpy.props.StringProperty(
+        name="Weight column",
+        description="Column summed in each voxel (empty counts the points)",
+        default="",
+    )
+
+    density_smoothing: bpy.props.FloatProperty(
+        name="Smoothing",
+        description="Width (sigma) of the Gaussian smoothing kernel, in voxels",
+        default=1.0,
+        min=0.0,
+    )
+
+    native_points: bpy.props.BoolProperty(
+        name="Native points",
+        description=(
+            "Draw the solid (Use Mesh) representation as points with a radius "
+            "instead of instanced sphere meshes; Cycles renders them as spheres "
+            "at a fraction of the memory"
+        ),
+        default=False,
+    )
+
+    build_lod: bpy.props.BoolProperty(
+        name="Build LOD levels",
+        description=(
+            "Store the octree level of every point (lod_level attribute) and thin "
+            "out the points far from the active camera"
+        ),
+        default=False,
+    )
+
 
 class PointcloudMaterial_Props:
     @staticmethod
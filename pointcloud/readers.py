@@ -0,0 +1,230 @@
+import os
+from collections.abc import Iterator
+
+import numpy as np
+
+from ..utilities.arrays import Load_array, Npz_keys
+
+# bytes of text parsed at once; bounds the temporary memory of the CSV reader
+_CSV_CHUNK_BYTES = 1 << 24
+
+
+def _is_header(line: str) -> bool:
+    """A first line with anything other than plain numbers is a header."""
+    try:
+        for part in line.split(","):
+            float(part)
+    except ValueError:
+        return True
+    return False
+
+
+def Default_column_names(ncols: int) -> list[str]:
+    """Names of headerless columns: x, y, z, then col_0, col_1, ..."""
+    return [f"col_{i - 3}" if i >= 3 else "xyz"[i] for i in range(ncols)]
+
+
+def Select_columns(names: list[str], columns: list[str] | None) -> list[str]:
+    """Resolves the requested subset of ``names``.
+
+    x, y and z are always kept (the pointcloud is built from them); an empty or
+    missing subset selects every column.
+    """
+    if not columns:
+        return list(names)
+    missing = [c for c in columns if c not in names]
+    if missing:
+        raise ValueError(
+            f"Columns not found: {', '.join(missing)} (available: {', '.join(names)})"
+        )
+    return [n for n in names if n in ("x", "y", "z") or n in columns]
+
+
+def _count_lines(path: str) -> int:
+    count, last = 0, b"\n"
+    with open(path, "rb") as f:
+        while block := f.read(_CSV_CHUNK_BYTES):
+            count += block.count(b"\n")
+            last = block[-1:]
+    return count + (last != b"\n")
+
+
+def _csv_columns(
+    path: str, columns: list[str] | None
+) -> tuple[bool, list[str], list[str]]:
+    """Returns whether a CSV has a header, the selected column names and all of
+    its column names."""
+    with open(path) as f:
+        first_line = f.readline()
+        second_line = f.readline()
+    has_header = _is_header(first_line)
+    data_line = second_line if has_header else first_line
+    if data_line.strip() == "":
+        raise ValueError(f"No data rows in {path}")
+    ncols = len(data_line.split(","))
+    if has_header:
+        names = [c.strip() for c in first_line.replace("#", "").split(",")]
+        if len(names) != ncols:
+            raise ValueError(
+                f"The header of {path} names {len(names)} columns, "
+                f"but the rows have {ncols}"
+            )
+    else:
+        names = Default_column_names(ncols)
+    return has_header, Select_columns(names, columns), names
+
+
+def Csv_chunks(
+    path: str, columns: list[str] | None = None
+) -> Iterator[dict[str, np.ndarray]]:
+    """Parses a comma-separated file chunk by chunk, yielding the selected
+    columns of each chunk as float32 arrays (see ``Read_csv``)."""
+    has_header, selected, names = _csv_columns(path, columns)
+    usecols = [names.index(n) for n in selected]
+    with open(path, "rb") as f:
+        if has_header:
+            f.readline()
+        while lines := f.readlines(_CSV_CHUNK_BYTES):
+            # comments and blank lines are skipped, so a chunk may yield fewer rows
+            rows = np.loadtxt(
+                lines, delimiter=",", usecols=usecols, dtype=np.float32, ndmin=2
+            )
+            yield {name: rows[:, i] for i, name in enumerate(selected)}
+
+
+def Read_csv(path: str, columns: list[str] | None = None) -> dict[str, np.ndarray]:
+    """Reads the columns of a comma-separated file as float32 arrays.
+
+    The header (if any) is detected from the first line; without one, columns
+    are named x, y, z, col_0, col_1, ... The file is parsed in chunks straight
+    into preallocated arrays of the selected columns only, so memory stays at
+    about the size of the result.
+    """
+    has_header, selected, _ = _csv_columns(path, columns)
+    nrows = _count_lines(path) - has_header
+    out = {name: np.empty(nrows, dtype=np.float32) for name in selected}
+
+    filled = 0
+    for chunk in Csv_chunks(path, columns):
+        n = len(next(iter(chunk.values())))
+        for name, values in chunk.items():
+            out[name][filled : filled + n] = values
+        filled += n
+    return {name: values[:filled] for name, values in out.items()}
+
+
+def Read_npz(path: str, columns: list[str] | None = None) -> dict[str, np.ndarray]:
+    """Opens the selected datasets of an ``.npz`` file (memory-mapped when stored
+    uncompressed)."""
+    return {k: Load_array(path, k) for k in Select_columns(Npz_keys(path), columns)}
+
+
+def Read_npy_directory(
+    path: str, columns: list[str] | None = None
+) -> dict[str, np.ndarray]:
+    """Memory-maps the selected ``<column>.npy`` files of a directory."""
+    files = {
+        os.path.splitext(n)[0]: os.path.join(path, n)
+        for n in sorted(os.listdir(path))
+        if n.lower().endswith(".npy")
+    }
+    if not files:
+        raise ValueError(f"No .npy files in {path}")
+    return {k: Load_array(files[k]) for k in Select_columns(list(files), columns)}
+
+
+def Read_arrow(path: str, columns: list[str] | None = None) -> dict[str, np.ndarray]:
+    """Reads the selected columns of a Parquet or Feather/Arrow IPC file.
+
+    Requires ``pyarrow``. Feather files are memory-mapped, and columns without
+    nulls stored in a single chunk are returned without a copy.
+    """
+    try:
+        import pyarrow  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+        from pyarrow import feather, ipc  # type: ignore
+    except ImportError:
+        raise ValueError("Reading Parquet/Feather files requires pyarrow") from None
+
+    if path.lower().endswith(".parquet"):
+        selected = Select_columns(pq.ParquetFile(path).schema_arrow.names, columns)
+        table = pq.read_table(path, columns=selected, memory_map=True)
+    else:
+        # only the schema is read here, so unselected columns are never touched
+        with pyarrow.memory_map(path) as source:
+            names = ipc.open_file(source).schema.names
+        selected = Select_columns(names, columns)
+        table = feather.read_table(path, columns=selected, memory_map=True)
+    return {name: table.column(name).to_numpy() for name in selected}
+
+
+def Read_hdf5(path: str, columns: list[str] | None = None) -> dict[str, np.ndarray]:
+    """Reads the selected top-level datasets of an HDF5 file.
+
+    Requires ``h5py``. Contiguous, uncompressed datasets are memory-mapped
+    through their offset in the file; all others are read in full.
+    """
+    try:
+        import h5py  # type: ignore
+    except ImportError:
+        raise ValueError("Reading HDF5 files requires h5py") from None
+
+    data = {}
+    with h5py.File(path, "r") as f:
+        names = [k for k, v in f.items() if isinstance(v, h5py.Dataset)]
+        for name in Select_columns(names, columns):
+            ds = f[name]
+            offset = ds.id.get_offset()
+            if ds.chunks is None and offset is not None and not ds.dtype.hasobject:
+                data[name] = np.memmap(
+                    path, dtype=ds.dtype, mode="r", offset=offset, shape=ds.shape
+                )
+            else:
+                data[name] = ds[()]
+    return data
+
+
+_READERS = {
+    ".npz": Read_npz,
+    ".csv": Read_csv,
+    ".parquet": Read_arrow,
+    ".feather": Read_arrow,
+    ".arrow": Read_arrow,
+    ".h5": Read_hdf5,
+    ".hdf5": Read_hdf5,
+}
+
+FORMATS = "a directory of .npy files, " + ", ".join(_READERS)
+
+
+def Read_pointcloud(
+    path: str, columns: list[str] | None = None
+) -> dict[str, np.ndarray]:
+    """Loads the requested columns (plus x, y, z) of a pointcloud file, or of a
+    directory of ``.npy`` columns, picking the reader by extension.
+
+    Raises ValueError with a user-facing message for unsupported inputs.
+    """
+    if os.path.isdir(path):
+        return Read_npy_directory(path, columns)
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _READERS:
+        raise ValueError(f"Unsupported file format. Please use {FORMATS}")
+    return _READERS[ext](path, columns)
+
+
+def Pointcloud_chunks(
+    path: str, columns: list[str] | None = None, chunk_rows: int = 1 << 20
+) -> Iterator[dict[str, np.ndarray]]:
+    """Yields the selected columns of a pointcloud file in chunks of rows.
+
+    CSVs are parsed chunk by chunk, and memory-mapped formats are only read as
+    each chunk is sliced, so the whole input never has to be in memory.
+    """
+    if not os.path.isdir(path) and path.lower().endswith(".csv"):
+        yield from Csv_chunks(path, columns)
+        return
+    data = Read_pointcloud(path, columns)
+    npoints = len(next(iter(data.values())))
+    for i in range(0, npoints, chunk_rows):
+        yield {k: np.asarray(v[i : i + chunk_rows]) for k, v in data.items()}
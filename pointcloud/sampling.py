@@ -0,0 +1,173 @@
+from collections.abc import Callable, Iterable
+
+import numpy as np
+
+Chunks = Callable[[], Iterable[dict[str, np.ndarray]]]
+
+
+def _chunk_size(chunk: dict[str, np.ndarray]) -> int:
+    return len(next(iter(chunk.values())))
+
+
+def _top_keys(
+    chunks: Iterable[dict[str, np.ndarray]],
+    budget: int,
+    keys_for: Callable[[dict[str, np.ndarray]], np.ndarray],
+) -> tuple[dict[str, np.ndarray], int]:
+    """Keeps the ``budget`` points with the largest keys while streaming.
+
+    Points with a key of -inf are never kept. Returns the kept points in input
+    order and the number of points seen.
+    """
+    kept: dict[str, np.ndarray] = {}
+    kept_keys = np.empty(0, dtype=np.float64)
+    kept_index = np.empty(0, dtype=np.int64)
+    total = 0
+    for chunk in chunks:
+        n = _chunk_size(chunk)
+        keys = keys_for(chunk)
+        index = np.arange(total, total + n)
+        total += n
+        # once the reservoir is full, only keys above its minimum can enter
+        threshold = kept_keys.min() if kept_keys.size >= budget else -np.inf
+        mask = keys > threshold
+        if not mask.any():
+            continue
+        kept_keys = np.concatenate([kept_keys, keys[mask]])
+        kept_index = np.concatenate([kept_index, index[mask]])
+        kept = {
+            k: np.concatenate([kept[k], v[mask]]) if k in kept else v[mask].copy()
+            for k, v in chunk.items()
+        }
+        if kept_keys.size > budget:
+            top = np.argpartition(kept_keys, kept_keys.size - budget)[-budget:]
+            kept_keys, kept_index = kept_keys[top], kept_index[top]
+            kept = {k: v[top] for k, v in kept.items()}
+    order = np.argsort(kept_index, kind="stable")
+    return {k: v[order] for k, v in kept.items()}, total
+
+
+def Random_sample(
+    chunks: Chunks, budget: int, seed: int = 0
+) -> tuple[dict[str, np.ndarray], int]:
+    """Uniformly samples ``budget`` points in a single pass (reservoir sampling
+    with random keys)."""
+    rng = np.random.default_rng(seed)
+    return _top_keys(chunks(), budget, lambda c: rng.random(_chunk_size(c)))
+
+
+def Importance_sample(
+    chunks: Chunks, budget: int, weight: str, seed: int = 0
+) -> tuple[dict[str, np.ndarray], int]:
+    """Samples ``budget`` points without replacement with probabilities
+    proportional to the ``weight`` column, in a single pass.
+
+    Uses the Efraimidis-Spirakis keys ``u ** (1 / w)`` (compared as logarithms);
+    points with non-positive or non-finite weights are never selected.
+    """
+    rng = np.random.default_rng(seed)
+
+    def _keys(chunk: dict[str, np.ndarray]) -> np.ndarray:
+        if weight not in chunk:
+            raise ValueError(f"Weight column '{weight}' not found")
+        w = np.asarray(chunk[weight], dtype=np.float64)
+        # 1 - u lies in (0, 1], so its logarithm is finite
+        log_u = np.log1p(-rng.random(w.size))
+        valid = np.isfinite(w) & (w > 0)
+        keys = np.full(w.size, -np.inf)
+        keys[valid] = log_u[valid] / w[valid]
+        return keys
+
+    return _top_keys(chunks(), budget, _keys)
+
+
+def Voxel_sample(
+    chunks: Chunks, budget: int, seed: int = 0
+) -> tuple[dict[str, np.ndarray], int]:
+    """Replaces the points in each cell of a regular grid by their average.
+
+    ``chunks`` is called twice: the first pass finds the bounding box, which is
+    split into about ``budget`` cells, the second one accumulates the per-cell
+    sums of every column. Only occupied cells are stored. If more than
+    ``budget`` cells are occupied, a random subset of them is returned.
+    """
+    lo = np.full(3, np.inf)
+    hi = np.full(3, -np.inf)
+    total = 0
+    for chunk in chunks():
+        xyz = np.stack([chunk[a] for a in "xyz"], axis=1)
+        total += len(xyz)
+        if len(xyz):
+            lo = np.minimum(lo, xyz.min(axis=0))
+            hi = np.maximum(hi, xyz.max(axis=0))
+    if total == 0:
+        return {}, 0
+
+    extent = hi - lo
+    spanned = extent > 0
+    if spanned.any():
+        cell = (np.prod(extent[spanned]) / budget) ** (1 / spanned.sum())
+    else:
+        cell = 1.0
+    dims = np.maximum(1, np.ceil(extent / cell)).astype(np.int64)
+
+    ids = np.empty(0, dtype=np.int64)
+    counts = np.empty(0, dtype=np.float64)
+    sums: dict[str, np.ndarray] = {}
+    for chunk in chunks():
+        ijk = [
+            np.clip(((chunk[a] - lo[i]) / cell).astype(np.int64), 0, dims[i] - 1)
+            for i, a in enumerate("xyz")
+        ]
+        cid = ijk[0] + dims[0] * (ijk[1] + dims[1] * ijk[2])
+        # merge the chunk's cells with the accumulated ones
+        ids, inverse = np.unique(np.concatenate([ids, cid]), return_inverse=True)
+        nacc = counts.size
+        counts = np.bincount(
+            inverse,
+            weights=np.concatenate([counts, np.ones(cid.size)]),
+            minlength=ids.size,
+        )
+        sums = {
+            k: np.bincount(
+                inverse,
+                weights=np.concatenate(
+                    [sums.get(k, np.zeros(nacc)), np.asarray(v, dtype=np.float64)]
+                ),
+                minlength=ids.size,
+            )
+            for k, v in chunk.items()
+        }
+
+    result = {k: (v / counts).astype(np.float32) for k, v in sums.items()}
+    if ids.size > budget:
+        rng = np.random.default_rng(seed)
+        keep = np.sort(rng.choice(ids.size, budget, replace=False))
+        result = {k: v[keep] for k, v in result.items()}
+    return result, total
+
+
+def Reduce_points(
+    chunks: Chunks,
+    mode: str,
+    budget: int,
+    weight: str = "",
+    seed: int = 0,
+) -> tuple[dict[str, np.ndarray], int]:
+    """Streams the chunks of a pointcloud and keeps at most ``budget`` points.
+
+    ``mode`` is one of "RANDOM", "VOXEL" or "IMPORTANCE" (weighted by the
+    ``weight`` column). Returns the reduced columns and the number of input
+    points.
+    """
+    if budget < 1:
+        raise ValueError("The point budget must be positive")
+    if mode == "RANDOM":
+        return Random_sample(chunks, budget, seed)
+    if mode == "VOXEL":
+        return Voxel_sample(chunks, budget, seed)
+    if mode == "IMPORTANCE":
+        if weight == "":
+            raise ValueError("Importance sampling needs a weight column")
+        return Importance_sample(chunks, budget, weight, seed)
+    raise ValueError(f"Unknown reduction mode: {mode}")
@@ -0,0 +1,217 @@
+import numpy as np
+
+# bits per axis of the Morton codes; 3 * 21 bits still fit in a uint64
+_MAX_BITS = 21
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """Inserts two zero bits between each of the lowest 21 bits of ``v``."""
+    v = v & np.uint64(0x1FFFFF)
+    v = (v | (v << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return v
+
+
+def Quantize_points(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray, bits: int
+) -> np.ndarray:
+    """Maps points onto a ``2**bits`` integer grid over their bounding cube.
+
+    Returns an (N, 3) uint64 array; the cube (rather than the box) keeps the
+    cells of every axis equally sized.
+    """
+    if not 0 < bits <= _MAX_BITS:
+        raise ValueError(f"bits must be between 1 and {_MAX_BITS}")
+    pts = np.stack([x, y, z], axis=1).astype(np.float64)
+    if len(pts) == 0:
+        return np.zeros((0, 3), dtype=np.uint64)
+    lo = pts.min(axis=0)
+    extent = (pts.max(axis=0) - lo).max()
+    scale = (2**bits - 1) / extent if extent > 0 else 0.0
+    q = np.rint((pts - lo) * scale)
+    return np.clip(q, 0, 2**bits - 1).astype(np.uint64)
+
+
+def Morton_codes(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray, bits: int = 16
+) -> np.ndarray:
+    """Z-order (Morton) codes of the points, with ``bits`` bits per axis."""
+    q = Quantize_points(x, y, z, bits)
+    return (
+        _spread_bits(q[:, 0])
+        | (_spread_bits(q[:, 1]) << np.uint64(1))
+        | (_spread_bits(q[:, 2]) << np.uint64(2))
+    )
+
+
+def Hilbert_codes(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray, bits: int = 16
+) -> np.ndarray:
+    """Hilbert curve indices of the points, with ``bits`` bits per axis.
+
+    Vectorized form of Skilling's "axes to transpose" algorithm (AIP Conf. Proc.
+    707, 2004); unlike Z-order, consecutive indices are always adjacent cells.
+    """
+    q = Quantize_points(x, y, z, bits)
+    X = [q[:, 0].copy(), q[:, 1].copy(), q[:, 2].copy()]
+    m = np.uint64(1 << (bits - 1))
+
+    # inverse undo
+    Q = m
+    while Q > 1:
+        P = Q - np.uint64(1)
+        X[0] = np.where(X[0] & Q, X[0] ^ P, X[0])
+        for i in (1, 2):
+            flip = (X[i] & Q) != 0
+            t = (X[0] ^ X[i]) & P
+            X[0] = np.where(flip, X[0] ^ P, X[0] ^ t)
+            X[i] = np.where(flip, X[i], X[i] ^ t)
+        Q >>= np.uint64(1)
+
+    # Gray encode
+    X[1] ^= X[0]
+    X[2] ^= X[1]
+    t = np.zeros_like(X[0])
+    Q = m
+    while Q > 1:
+        t = np.where(X[2] & Q, t ^ (Q - np.uint64(1)), t)
+        Q >>= np.uint64(1)
+    X = [v ^ t for v in X]
+
+    return (
+        (_spread_bits(X[0]) << np.uint64(2))
+        | (_spread_bits(X[1]) << np.uint64(1))
+        | _spread_bits(X[2])
+    )
+
+
+def Spatial_order(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray, curve: str, bits: int = 16
+) -> np.ndarray:
+    """Permutation sorting the points along a "MORTON" or "HILBERT" curve."""
+    if curve == "MORTON":
+        codes = Morton_codes(x, y, z, bits)
+    elif curve == "HILBERT":
+        codes = Hilbert_codes(x, y, z, bits)
+    else:
+        raise ValueError(f"Unknown space-filling curve: {curve}")
+    return np.argsort(codes, kind="stable")
+
+
+def Octree_levels(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray, bits: int = 16, seed: int = 0
+) -> np.ndarray:
+    """Assigns every point the octree depth at which it first becomes visible.
+
+    Depth ``l`` splits the bounding cube into ``8**l`` cells; every occupied
+    cell contributes one random point that no shallower level has taken, so
+    the points of levels ``0..l`` are a spatially uniform subset at resolution
+    ``2**l``. Points left over at the deepest level get ``bits + 1``.
+
+    The cells of each depth are contiguous runs in Morton order, so the points
+    are sorted only once.
+    """
+    codes = Morton_codes(x, y, z, bits)
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    rng = np.random.default_rng(seed)
+
+    levels = np.full(codes.size, bits + 1, dtype=np.int32)
+    remaining = np.arange(codes.size)
+    for level in range(bits + 1):
+        if remaining.size == 0:
+            break
+        cells = codes[remaining] >> np.uint64(3 * (bits - level))
+        starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+        counts = np.diff(np.r_[starts, cells.size])
+        picked = starts + (rng.random(starts.size) * counts).astype(np.int64)
+        levels[remaining[picked]] = level
+        unpicked = np.ones(remaining.size, dtype=bool)
+        unpicked[picked] = False
+        remaining = remaining[unpicked]
+
+    result = np.empty_like(levels)
+    result[order] = levels
+    return result
+
+
+def _gaussian_blur(grid: np.ndarray, sigma: float) -> np.ndarray:
+    """Separable Gaussian blur with a kernel truncated at 3 sigma."""
+    r = int(np.ceil(3 * sigma))
+    kernel = np.exp(-0.5 * (np.arange(-r, r + 1) / sigma) ** 2)
+    kernel = (kernel / kernel.sum()).astype(grid.dtype)
+    for axis in range(grid.ndim):
+        n = grid.shape[axis]
+        out = np.zeros_like(grid)
+        for offset, w in zip(range(-r, r + 1), kernel):
+            # out[i] += w * grid[i + offset]
+            src = [slice(None)] * grid.ndim
+            dst = [slice(None)] * grid.ndim
+            src[axis] = slice(max(0, offset), n + min(0, offset))
+            dst[axis] = slice(max(0, -offset), n - max(0, offset))
+            out[tuple(dst)] += w * grid[tuple(src)]
+        grid = out
+    return grid
+
+
+def Grid_frame(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray, resolution: int, pad: int = 0
+) -> tuple[np.ndarray, float, np.ndarray]:
+    """Splits the bounding box of the points into cubic voxels, ``resolution``
+    along its longest side, plus ``pad`` voxels on every side; returns the
+    corner of the first voxel, the voxel size and the grid dimensions."""
+    lo = np.array([np.min(x), np.min(y), np.min(z)], dtype=np.float64)
+    hi = np.array([np.max(x), np.max(y), np.max(z)], dtype=np.float64)
+    extent = hi - lo
+    voxel = float(extent.max()) / resolution if extent.max() > 0 else 1.0
+    dims = np.maximum(1, np.ceil(extent / voxel)).astype(np.int64)
+    return lo - pad * voxel, voxel, dims + 2 * pad
+
+
+def Smoothing_pad(sigma: float) -> int:
+    """Voxels added on every side of a grid smoothed with ``sigma``."""
+    return int(np.ceil(3 * sigma)) if sigma > 0 else 0
+
+
+def Density_grid(
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    resolution: int,
+    weights: np.ndarray | None = None,
+    sigma: float = 0.0,
+    chunk_size: int = 1 << 22,
+) -> tuple[np.ndarray, np.ndarray, float]:
+    """Bins points into a regular float32 grid in (X, Y, Z) order.
+
+    The voxels are those of ``Grid_frame``. Each one holds the number of points
+    in it (or the sum of their ``weights``), optionally smoothed with a
+    Gaussian of ``sigma`` voxels (the grid is then padded by the kernel
+    radius), and normalized to a maximum of 1. Returns the grid, the corner of
+    its first voxel and the voxel size.
+    """
+    pad = Smoothing_pad(sigma)
+    lo, voxel, dims = Grid_frame(x, y, z, resolution, pad)
+    counts = np.zeros(int(np.prod(dims)), dtype=np.float64)
+    for i in range(0, len(x), chunk_size):
+        ijk = []
+        for a, c in enumerate((x, y, z)):
+            offset = np.asarray(c[i : i + chunk_size], dtype=np.float64) - lo[a]
+            ijk.append(
+                np.clip((offset / voxel).astype(np.int64), pad, dims[a] - 1 - pad)
+            )
+        w = None if weights is None else np.asarray(weights[i : i + chunk_size])
+        counts += np.bincount(
+            (ijk[0] * dims[1] + ijk[1]) * dims[2] + ijk[2],
+            weights=w,
+            minlength=counts.size,
+        )
+    grid = counts.reshape(tuple(dims)).astype(np.float32)
+    if sigma > 0:
+        grid = _gaussian_blur(grid, sigma)
+    if (peak := grid.max()) > 0:
+        grid /= peak
+    return grid, lo, voxel
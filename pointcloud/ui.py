@@ -46,8 +46,26 @@ class BLENDET_PT_pointcloud_3dv(bpy.types.Panel):
         if (layout := self.layout) is None or (scene := context.scene) is None:
             return
         props = scene.blend_et_pointcloud
-        layout.label(text="NumPy/CSV → Pointcloud (.npz/.csv)")
+        layout.label(text="Columns → Pointcloud (.npz/.csv/.parquet/.h5/...)")
         layout.prop(props, "pointcloud_path")
+        layout.prop(props, "pointcloud_columns")
+
+        box = layout.box()
+        box.row().prop(props, "reduction_mode")
+        if props.reduction_mode != "NONE":
+            box.row().prop(props, "reduction_budget")
+        if props.reduction_mode == "IMPORTANCE":
+            box.row().prop(props, "reduction_weight")
+        layout.prop(props, "point_order")
+        layout.prop(props, "build_lod")
+        layout.prop(props, "native_points")
+
+        box = layout.box()
+        box.row().prop(props, "density_grid")
+        if props.density_grid:
+            box.row().prop(props, "density_resolution")
+            box.row().prop(props, "density_weight")
+            box.row().prop(props, "density_smoothing")
 
         layout.separator()
         layout.row().operator("blend_et.pointcloud_create", icon="POINTCLOUD_DATA")
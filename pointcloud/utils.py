@@ -18,6 +18,8 @@ def Create_pointcloud_mesh(
     material_volume: bpy.types.Material | None = None,
     material_mesh: bpy.types.Material | None = None,
     uuid_str: str = "",
+    use_lod: bool = False,
+    native_points: bool = False,
 ):
     suffix = f"_{uuid_str}" if uuid_str != "" else ""
 
@@ -69,6 +71,20 @@ def Create_pointcloud_mesh(
                     "height": 0.75,
                 }
                 for attr in "xyz"
+            ]
+            + [
+                {
+                    "type_id": "GeometryNodeInputNamedAttribute",
+                    "label": "Attr LOD",
+                    "data_type": "FLOAT",
+                    "input_defaults": {0: "lod_level"},
+                    "height": 0.75,
+                },
+                {
+                    "type_id": "GeometryNodeInputActiveCamera",
+                    "label": "Active Camera",
+                    "height": 0.5,
+                },
             ],
             [
                 {
@@ -119,6 +135,15 @@ def Create_pointcloud_mesh(
                     "height": 1.5,
                 }
                 for attr in "xyz"
+            ]
+            + [
+                {
+                    "type_id": "GeometryNodeSampleIndex",
+                    "label": "Sample LOD",
+                    "data_type": "FLOAT",
+                    "domain": "POINT",
+                    "height": 1.5,
+                },
             ],
             [
                 {
@@ -129,6 +154,12 @@ def Create_pointcloud_mesh(
                     "type_id": "GeometryNodeMeshIcoSphere",
                     "label": "Sphere",
                 },
+                {
+                    "type_id": "GeometryNodeObjectInfo",
+                    "label": "Camera Info",
+                    "transform_space": "RELATIVE",
+                    "height": 1.5,
+                },
             ],
             [
                 {
@@ -139,6 +170,50 @@ def Create_pointcloud_mesh(
                     "type_id": "GeometryNodeInstanceOnPoints",
                     "label": "Instance Spheres",
                 },
+                {
+                    "type_id": "GeometryNodeInputPosition",
+                    "label": "Position",
+                    "height": 0.5,
+                },
+                {
+                    "type_id": "ShaderNodeVectorMath",
+                    "label": "Camera Distance",
+                    "operation": "DISTANCE",
+                },
+            ],
+            [
+                {
+                    "type_id": "ShaderNodeMath",
+                    "label": "Distance Ratio",
+                    "operation": "DIVIDE",
+                },
+                {
+                    "type_id": "ShaderNodeMath",
+                    "label": "log2(Distance Ratio)",
+                    "operation": "LOGARITHM",
+                    "input_defaults": {1: 2.0},
+                },
+                {
+                    "type_id": "ShaderNodeMath",
+                    "label": "Visible Level",
+                    "operation": "SUBTRACT",
+                },
+                {
+                    "type_id": "FunctionNodeCompare",
+                    "label": "Beyond Visible Level",
+                    "data_type": "FLOAT",
+                    "operation": "GREATER_THAN",
+                },
+                {
+                    "type_id": "FunctionNodeBooleanMath",
+                    "label": "Cull LOD",
+                    "operation": "AND",
+                },
+                {
+                    "type_id": "GeometryNodeDeleteGeometry",
+                    "label": "LOD Cull",
+                    "domain": "POINT",
+                },
             ],
             [
                 {
@@ -150,6 +225,15 @@ def Create_pointcloud_mesh(
                     "type_id": "GeometryNodeSetShadeSmooth",
                     "label": "Shade Smooth",
                 },
+                {
+                    "type_id": "GeometryNodeSetPointRadius",
+                    "label": "Set Point Radius",
+                },
+                {
+                    "type_id": "GeometryNodeSwitch",
+                    "label": "Switch Points",
+                    "input_type": "GEOMETRY",
+                },
             ],
             [
                 {
@@ -226,6 +310,47 @@ def Create_pointcloud_mesh(
                 "default_value": 2,
                 "description": "Sphere resolutions",
             },
+            {
+                "name": "Use LOD",
+                "in_out": "INPUT",
+                "type": "NodeSocketBool",
+                "description": (
+                    "Hide points whose octree level is too fine for their distance "
+                    "to the active camera (requires LOD levels built on import)"
+                ),
+                "default_value": False,
+            },
+            {
+                "name": "LOD Distance",
+                "in_out": "INPUT",
+                "type": "NodeSocketFloat",
+                "min_value": 0.0,
+                "default_value": 10.0,
+                "max_value": 3.4028234663852886e38,
+                "subtype": "DISTANCE",
+                "description": (
+                    "Camera distance at which octree levels up to LOD Detail are "
+                    "shown; each doubling of the distance hides one more level"
+                ),
+            },
+            {
+                "name": "LOD Detail",
+                "in_out": "INPUT",
+                "type": "NodeSocketFloat",
+                "default_value": 6.0,
+                "description": "Deepest octree level shown at LOD Distance",
+            },
+            {
+                "name": "Native Points",
+                "in_out": "INPUT",
+                "type": "NodeSocketBool",
+                "description": (
+                    "Render the solid representation as points with a radius, "
+                    "which Cycles draws as spheres, instead of instancing a mesh "
+                    "sphere on every point"
+                ),
+                "default_value": False,
+            },
         ],
         node_links=[
             (("GroupInput", "Voxel Resolution"), ("PointsToVolume", "Voxel Amount")),
@@ -263,11 +388,33 @@ def Create_pointcloud_mesh(
             (("SampleZ", "Value"), ("CombineXYZ", "Z")),
             (("CombineXYZ", "Vector"), ("Points", "Position")),
             (("Sphere", "Mesh"), ("InstanceSpheres", "Instance")),
-            (("Points", "Points"), ("PointsToVolume", "Points")),
-            (("Points", "Points"), ("InstanceSpheres", "Points")),
+            (("GroupInput", "Use LOD"), ("CullLOD", 0)),
+            (("GroupInput", "LOD Distance"), ("DistanceRatio", 1)),
+            (("GroupInput", "LOD Detail"), ("VisibleLevel", 0)),
+            (("PointcloudData", "Geometry"), ("SampleLOD", "Geometry")),
+            (("AttrLOD", "Attribute"), ("SampleLOD", "Value")),
+            (("SwitchIndex", "Output"), ("SampleLOD", "Index")),
+            (("ActiveCamera", "Active Camera"), ("CameraInfo", "Object")),
+            (("Position", "Position"), ("CameraDistance", 0)),
+            (("CameraInfo", "Location"), ("CameraDistance", 1)),
+            (("CameraDistance", "Value"), ("DistanceRatio", 0)),
+            (("DistanceRatio", "Value"), ("log2(DistanceRatio)", 0)),
+            (("log2(DistanceRatio)", "Value"), ("VisibleLevel", 1)),
+            (("SampleLOD", "Value"), ("BeyondVisibleLevel", 0)),
+            (("VisibleLevel", "Value"), ("BeyondVisibleLevel", 1)),
+            (("BeyondVisibleLevel", "Result"), ("CullLOD", 1)),
+            (("CullLOD", "Boolean"), ("LODCull", "Selection")),
+            (("Points", "Points"), ("LODCull", "Geometry")),
+            (("LODCull", "Geometry"), ("PointsToVolume", "Points")),
+            (("LODCull", "Geometry"), ("InstanceSpheres", "Points")),
             (("PointsToVolume", "Volume"), ("MaterialVolume", "Geometry")),
             (("InstanceSpheres", "Instances"), ("ShadeSmooth", "Geometry")),
-            (("ShadeSmooth", "Geometry"), ("MaterialSpheres", "Geometry")),
+            (("GroupInput", "Native Points"), ("SwitchPoints", "Switch")),
+            (("GroupInput", "Sphere Sizes"), ("SetPointRadius", "Radius")),
+            (("LODCull", "Geometry"), ("SetPointRadius", "Points")),
+            (("ShadeSmooth", "Geometry"), ("SwitchPoints", "False")),
+            (("SetPointRadius", "Points"), ("SwitchPoints", "True")),
+            (("SwitchPoints", "Output"), ("MaterialSpheres", "Geometry")),
             (("MaterialVolume", "Geometry"), ("SwitchGeometry", "False")),
             (("MaterialSpheres", "Geometry"), ("SwitchGeometry", "True")),
             (("SwitchGeometry", "Output"), ("GroupOutput", "Geometry")),
@@ -283,6 +430,10 @@ def Create_pointcloud_mesh(
     set_modifier_input(modifier, "Socket_4", 100)
     set_modifier_input(modifier, "Socket_5", 1e-2)
     set_modifier_input(modifier, "Socket_6", 2)
+    set_modifier_input(modifier, "Socket_7", use_lod)
+    set_modifier_input(modifier, "Socket_8", 10.0)
+    set_modifier_input(modifier, "Socket_9", 6.0)
+    set_modifier_input(modifier, "Socket_10", native_points)
 
     return obj
 
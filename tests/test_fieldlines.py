@@ -23,8 +23,10 @@ class FieldlineTests(BlenderIntegrationTest):
         props.integration_direction = "Both"
         props.integration_step = 0.5
         props.integration_maxiter = 8
+        props.integration_scheme = "Euler"
+        props.integration_workers = 1
         props.seed_points = "XY"
-        props.seed_resolution = (1, 1)
+        props.seed_resolution = (2, 2)
         props.seed_displacement = 2.0
 
         self.assert_operator_finished(bpy.ops.blend_et.fieldlines_create())
@@ -36,11 +38,77 @@ class FieldlineTests(BlenderIntegrationTest):
 
         raw = bpy.data.collections.get("FieldlinesRaw_0000")
         self.assertIsNotNone(raw)
+        # every fieldline is packed into one raw object regardless of seed count
         self.assertEqual(1, len(raw.objects))
-        for obj in raw.objects:
-            self.assertGreater(len(obj.data.vertices), 0)
-            self.assertTrue(
-                {"x", "y", "z", "color", "thickness"}.issubset(
-                    obj.data.attributes.keys()
-                )
+        mesh = raw.objects[0].data
+        self.assertGreater(len(mesh.vertices), 0)
+        self.assertTrue(
+            {"x", "y", "z", "color", "thickness", "line_id"}.issubset(
+                mesh.attributes.keys()
             )
+        )
+        self.assertEqual("INT", mesh.attributes["line_id"].data_type)
+        line_ids = np.empty(len(mesh.vertices), dtype=np.int32)
+        mesh.attributes["line_id"].data.foreach_get("value", line_ids)
+        self.assertIn(0, line_ids)
+        self.assertTrue(set(np.unique(line_ids)).issubset(range(4)))
+
+    def test_parallel_tracing_matches_serial(self):
+        shape = (10, 10, 10)
+        _, y, x = np.indices(shape, dtype=np.float32)
+        path = self.workdir / "swirl_field.npz"
+        np.savez(path, bx=-(y - 4.5), by=x - 4.5, bz=np.full(shape, 0.3, np.float32))
+
+        props = bpy.context.scene.blend_et_fieldlines
+        props.npz_path = str(path)
+        props.crop_xmin, props.crop_xmax = 0, shape[2]
+        props.crop_ymin, props.crop_ymax = 0, shape[1]
+        props.crop_zmin, props.crop_zmax = 0, shape[0]
+        props.integration_direction = "Both"
+        props.integration_scheme = "RK45"
+        props.integration_maxiter = 50
+        props.seed_points = "XY"
+        props.seed_resolution = (4, 4)
+        props.seed_displacement = 4.0
+
+        def _trace(workers):
+            props.integration_workers = workers
+            self.assert_operator_finished(bpy.ops.blend_et.fieldlines_create())
+            uuid_str = f"{props.uuid - 1:04d}"
+            mesh = bpy.data.collections[f"FieldlinesRaw_{uuid_str}"].objects[0].data
+            values = np.empty(len(mesh.vertices), dtype=np.float32)
+            mesh.attributes["x"].data.foreach_get("value", values)
+            return values
+
+        np.testing.assert_array_equal(_trace(1), _trace(3))
+
+    def test_masked_field_ends_lines(self):
+        shape = (12, 12, 12)
+        fx = np.ones(shape, dtype=np.float32)
+        fx[:, :, 6] = np.nan
+        path = self.workdir / "masked_field.npz"
+        np.savez(path, bx=fx, by=np.zeros_like(fx), bz=np.zeros_like(fx))
+
+        props = bpy.context.scene.blend_et_fieldlines
+        props.npz_path = str(path)
+        props.crop_xmin, props.crop_xmax = 0, shape[2]
+        props.crop_ymin, props.crop_ymax = 0, shape[1]
+        props.crop_zmin, props.crop_zmax = 0, shape[0]
+        props.integration_direction = "Both"
+        props.integration_maxiter = 50
+        props.integration_workers = 1
+        props.seed_points = "XY"
+        props.seed_resolution = (2, 2)
+        props.seed_displacement = 2.0
+
+        for scheme in ("Euler", "RK2", "RK4", "RK45"):
+            with self.subTest(scheme=scheme):
+                props.integration_scheme = scheme
+                self.assert_operator_finished(bpy.ops.blend_et.fieldlines_create())
+                uuid_str = f"{props.uuid - 1:04d}"
+                raw = bpy.data.collections[f"FieldlinesRaw_{uuid_str}"]
+                mesh = raw.objects[0].data
+                for name in ("x", "y", "z", "color"):
+                    values = np.empty(len(mesh.vertices), dtype=np.float32)
+                    mesh.attributes[name].data.foreach_get("value", values)
+                    self.assertTrue(np.isfinite(values).all(), name)
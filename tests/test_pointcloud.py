@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 import bpy
 import numpy as np
 
@@ -37,6 +39,10 @@ class PointcloudTests(BlenderIntegrationTest):
             {"x", "y", "z", "temperature"}.issubset(attribute_names),
             f"Unexpected point attributes: {sorted(attribute_names)}",
         )
+        self.assertEqual(len(t), len(raw.data.vertices))
+        temperature = np.empty(len(t), dtype=np.float32)
+        raw.data.attributes["temperature"].data.foreach_get("value", temperature)
+        np.testing.assert_allclose(temperature, 1.0 - t)
 
     def test_csv_pointcloud(self):
         path = self.workdir / "points.csv"
@@ -53,3 +59,195 @@ class PointcloudTests(BlenderIntegrationTest):
 
         self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
         self._assert_pointcloud("0000")
+
+    def test_csv_pointcloud_columns(self):
+        path = self.workdir / "points.csv"
+        rows = np.random.default_rng(1).random((20, 5))
+        np.savetxt(path, rows, delimiter=",")
+        props = bpy.context.scene.blend_et_pointcloud
+        props.pointcloud_path = str(path)
+        props.pointcloud_columns = "col_1"
+
+        self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+        self._assert_pointcloud("0000")
+        raw = bpy.data.objects.get("PointcloudRawObj0000")
+        attribute_names = set(raw.data.attributes.keys())
+        self.assertTrue({"x", "y", "z", "col_1"}.issubset(attribute_names))
+        self.assertNotIn("col_0", attribute_names)
+        self.assertEqual(len(rows), len(raw.data.vertices))
+        values = np.empty(len(rows), dtype=np.float32)
+        raw.data.attributes["col_1"].data.foreach_get("value", values)
+        np.testing.assert_allclose(values, rows[:, 4], rtol=1e-6)
+
+    def test_npy_directory_pointcloud(self):
+        t = np.linspace(0.0, 1.0, 10, dtype=np.float32)
+        path = self.workdir / "columns"
+        path.mkdir(exist_ok=True)
+        for name, values in {"x": t, "y": 2 * t, "z": 3 * t, "mass": t**2}.items():
+            np.save(path / f"{name}.npy", values)
+        np.save(path / "unused.npy", t)
+        props = bpy.context.scene.blend_et_pointcloud
+        props.pointcloud_path = str(path)
+        props.pointcloud_columns = "mass"
+
+        self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+        self._assert_pointcloud("0000")
+        raw = bpy.data.objects.get("PointcloudRawObj0000")
+        attribute_names = set(raw.data.attributes.keys())
+        self.assertTrue({"x", "y", "z", "mass"}.issubset(attribute_names))
+        self.assertNotIn("unused", attribute_names)
+
+    def test_pointcloud_reduction(self):
+        rng = np.random.default_rng(2)
+        path = self.workdir / "many_points.npz"
+        np.savez(
+            path,
+            x=rng.random(5000),
+            y=rng.random(5000),
+            z=rng.random(5000),
+            mass=rng.random(5000),
+        )
+        props = bpy.context.scene.blend_et_pointcloud
+        props.pointcloud_path = str(path)
+        props.reduction_budget = 100
+
+        for suffix, mode in (("0000", "RANDOM"), ("0001", "IMPORTANCE")):
+            props.reduction_mode = mode
+            props.reduction_weight = "mass"
+            self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+            self._assert_pointcloud(suffix)
+            raw = bpy.data.objects.get(f"PointcloudRawObj{suffix}")
+            self.assertEqual(100, len(raw.data.vertices))
+
+        props.reduction_mode = "VOXEL"
+        self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+        raw = bpy.data.objects.get("PointcloudRawObj0002")
+        self.assertLessEqual(len(raw.data.vertices), 100)
+        self.assertIn("mass", raw.data.attributes)
+
+    def test_pointcloud_lod_levels(self):
+        rng = np.random.default_rng(3)
+        path = self.workdir / "lod_points.npz"
+        np.savez(path, x=rng.random(2000), y=rng.random(2000), z=rng.random(2000))
+        props = bpy.context.scene.blend_et_pointcloud
+        props.pointcloud_path = str(path)
+        props.build_lod = True
+
+        self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+        self._assert_pointcloud("0000")
+        self.assertIn(
+            "LODCull",
+            self.geometry_node_group(bpy.data.objects["PointcloudGeometry_0000"]).nodes,
+        )
+        raw = bpy.data.objects.get("PointcloudRawObj0000")
+        attribute = raw.data.attributes.get("lod_level")
+        self.assertIsNotNone(attribute)
+        self.assertEqual("INT", attribute.data_type)
+        levels = np.empty(2000, dtype=np.int32)
+        attribute.data.foreach_get("value", levels)
+        self.assertEqual(1, int((levels == 0).sum()))
+        self.assertEqual(8, int((levels == 1).sum()))
+
+    def test_pointcloud_hilbert_order(self):
+        rng = np.random.default_rng(4)
+        points = rng.random((3, 500))
+        path = self.workdir / "unordered.npz"
+        np.savez(path, x=points[0], y=points[1], z=points[2], id=np.arange(500))
+        props = bpy.context.scene.blend_et_pointcloud
+        props.pointcloud_path = str(path)
+        props.point_order = "HILBERT"
+
+        self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+        raw = bpy.data.objects.get("PointcloudRawObj0000")
+        ids = np.empty(500, dtype=np.int32)
+        raw.data.attributes["id"].data.foreach_get("value", ids)
+        self.assertEqual(list(range(500)), sorted(ids))
+        xyz = points[:, ids].T
+        ordered = np.linalg.norm(np.diff(xyz, axis=0), axis=1).mean()
+        unordered = np.linalg.norm(np.diff(points.T, axis=0), axis=1).mean()
+        self.assertLess(ordered, unordered / 2)
+
+    def test_pointcloud_density_grid(self):
+        rng = np.random.default_rng(5)
+        points = rng.normal(size=(3, 3000))
+        path = self.workdir / "dense_points.npz"
+        np.savez(path, x=points[0], y=points[1], z=points[2])
+        props = bpy.context.scene.blend_et_pointcloud
+        props.pointcloud_path = str(path)
+        props.density_grid = True
+        props.density_resolution = 16
+
+        self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+        volume = bpy.data.objects.get("PointcloudDensity_0000")
+        self.assertIsNotNone(volume)
+        self.assertEqual("VOLUME", volume.type)
+        self.assertTrue(Path(volume.data.filepath).is_file())
+        self.assertEqual("pointcloud_volume", volume.data.materials[0].get("category"))
+        self.assertTrue(bpy.data.objects["PointcloudGeometry_0000"].hide_render)
+
+        self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+        cached = bpy.data.objects.get("PointcloudDensity_0001")
+        self.assertEqual(volume.data.filepath, cached.data.filepath)
+
+    def test_density_grid_keeps_every_point(self):
+        try:
+            import pyopenvdb as vdb
+        except ImportError:
+            import openvdb as vdb
+
+        # the corners of a cube fill a 2x2x2 grid, the origin twice
+        corners = np.indices((2, 2, 2)).reshape(3, -1).astype(np.float32)
+        points = np.concatenate([corners, np.zeros((3, 1), np.float32)], axis=1)
+        path = self.workdir / "corners.npz"
+        np.savez(path, x=points[0], y=points[1], z=points[2])
+        props = bpy.context.scene.blend_et_pointcloud
+        props.pointcloud_path = str(path)
+        props.density_grid = True
+        props.density_resolution = 2
+        props.density_smoothing = 0.0
+
+        self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+        volume = bpy.data.objects["PointcloudDensity_0000"]
+        grid = vdb.read(bpy.path.abspath(volume.data.filepath), "density")
+        dense = np.zeros((3, 3, 3), dtype=np.float32)
+        grid.copyToArray(dense)
+        # normalized to the peak of two points
+        self.assertAlmostEqual(points.shape[1] / 2, float(dense.sum()), places=5)
+        self.assertEqual(0.5, float(dense[:2, :2, :2].min()))
+
+    def test_native_points(self):
+        t = np.linspace(0.0, 1.0, 50, dtype=np.float32)
+        path = self.workdir / "native.npz"
+        np.savez(path, x=t, y=t, z=t)
+        props = bpy.context.scene.blend_et_pointcloud
+        props.pointcloud_path = str(path)
+        props.native_points = True
+
+        self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+        self._assert_pointcloud("0000")
+        obj = bpy.data.objects["PointcloudGeometry_0000"]
+        nodes = self.geometry_node_group(obj).nodes
+        self.assertIn("SetPointRadius", nodes)
+        switch = nodes["SwitchPoints"]
+        self.assertTrue(
+            any(
+                link.from_node.name == "SetPointRadius"
+                for socket in switch.inputs
+                for link in socket.links
+            )
+        )
+
+    def test_wide_integer_columns_are_stored_as_float(self):
+        t = np.linspace(0.0, 1.0, 4, dtype=np.float32)
+        ids = np.array([1, 2, 2**40, 2**40 + 2**20], dtype=np.int64)
+        path = self.workdir / "wide_ids.npz"
+        np.savez(path, x=t, y=t, z=t, pid=ids, small=np.arange(4))
+        bpy.context.scene.blend_et_pointcloud.pointcloud_path = str(path)
+
+        self.assert_operator_finished(bpy.ops.blend_et.pointcloud_create())
+        attributes = bpy.data.objects["PointcloudRawObj0000"].data.attributes
+        self.assertEqual("FLOAT", attributes["pid"].data_type)
+        self.assertEqual("INT", attributes["small"].data_type)
+        pid = np.empty(4, dtype=np.float32)
+        attributes["pid"].data.foreach_get("value", pid)
+        self.assertTrue(np.all(np.diff(pid) > 0))
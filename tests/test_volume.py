@@ -37,6 +37,28 @@ class VolumeTests(BlenderIntegrationTest):
         self.assertTrue(volume.active_material.volume_hist_ready)
         self.assertIn("VolumeShader", volume.active_material.node_tree.nodes)
 
+        mat = volume.active_material
+        image = mat.volume_hist_image
+        linear = np.empty(len(image.pixels), dtype=np.float32)
+        image.pixels.foreach_get(linear)
+        mat.volume_hist_mode = "CDF"
+        cdf = np.empty_like(linear)
+        image.pixels.foreach_get(cdf)
+        self.assertGreater(cdf.sum(), linear.sum())
+
+        remap = mat.node_tree.nodes["RemapValues"]
+        mat.volume_remap_range = "MINMAX"
+        self.assertAlmostEqual(
+            mat.volume_hist_vmin, remap.inputs["From Min"].default_value, places=5
+        )
+        self.assertAlmostEqual(
+            mat.volume_hist_vmax, remap.inputs["From Max"].default_value, places=5
+        )
+        mat.volume_remap_range = "Q05_95"
+        self.assertAlmostEqual(
+            mat.volume_hist_q95, remap.inputs["From Max"].default_value, places=5
+        )
+
         generated_vdb = Path(bpy.path.abspath(volume.data.filepath))
         self.assertTrue(generated_vdb.is_file())
 
@@ -58,3 +80,141 @@ class VolumeTests(BlenderIntegrationTest):
 
         self.assert_operator_finished(bpy.ops.blend_et.volume_render_import_numpy())
         self.assertTrue(any(obj.type == "VOLUME" for obj in bpy.data.objects))
+
+    def test_numpy_import_reuses_cache(self):
+        data = self.gaussian_volume()
+        npy_path = self.workdir / "cached.npy"
+        np.save(npy_path, data)
+
+        props = bpy.context.scene.blend_et_volume_render
+        props.numpy_path = str(npy_path)
+        props.use_cache = True
+        self._configure_crop(data.shape)
+
+        self.assert_operator_finished(bpy.ops.blend_et.volume_render_import_numpy())
+        self.assert_operator_finished(bpy.ops.blend_et.volume_render_import_numpy())
+        volumes = [obj for obj in bpy.data.objects if obj.type == "VOLUME"]
+        self.assertEqual(2, len(volumes))
+        self.assertEqual(volumes[0].data.filepath, volumes[1].data.filepath)
+        self.assertTrue(volumes[1].active_material.volume_hist_ready)
+
+        props.numpy_crop_xmax = data.shape[0] - 1
+        self.assert_operator_finished(bpy.ops.blend_et.volume_render_import_numpy())
+        cache_dir = Path(bpy.path.abspath(volumes[0].data.filepath)).parent
+        self.assertEqual(2, len(list(cache_dir.glob("cached_*.vdb"))))
+
+        self.assert_operator_finished(
+            bpy.ops.blend_et.volume_render_prune_cache(clear=True)
+        )
+
+    def test_tiled_numpy_import(self):
+        data = self.gaussian_volume()
+        npy_path = self.workdir / "tiled.npy"
+        np.save(npy_path, data)
+
+        props = bpy.context.scene.blend_et_volume_render
+        props.numpy_path = str(npy_path)
+        props.numpy_tiled = True
+        props.numpy_brick_budget = 8
+        self._configure_crop(data.shape)
+
+        self.assert_operator_finished(bpy.ops.blend_et.volume_render_import_numpy())
+        volume = next(obj for obj in bpy.data.objects if obj.type == "VOLUME")
+        self.assertTrue(volume.active_material.volume_hist_ready)
+        self.assertTrue(Path(bpy.path.abspath(volume.data.filepath)).is_file())
+
+    def test_numpy_import_preview_levels(self):
+        data = self.gaussian_volume((16, 12, 10))
+        npy_path = self.workdir / "levels.npy"
+        np.save(npy_path, data)
+
+        props = bpy.context.scene.blend_et_volume_render
+        props.numpy_path = str(npy_path)
+        props.numpy_mip_levels = 2
+        self._configure_crop(data.shape)
+
+        self.assert_operator_finished(bpy.ops.blend_et.volume_render_import_numpy())
+        volume = next(obj for obj in bpy.data.objects if obj.type == "VOLUME").data
+        levels = volume["blend_et_levels"]
+        self.assertEqual({"1", "2", "4"}, set(levels.keys()))
+        self.assertEqual("4", volume.blend_et_preview_level)
+        self.assertEqual(levels["4"], volume.filepath)
+        for path in levels.values():
+            self.assertTrue(Path(bpy.path.abspath(path)).is_file())
+
+        volume.blend_et_preview_level = "1"
+        self.assertEqual(levels["1"], volume.filepath)
+
+    def test_numpy_sequence_import(self):
+        series = self.workdir / "series"
+        series.mkdir(exist_ok=True)
+        for i in (1, 2, 10):
+            np.save(series / f"snap_{i}.npy", i * self.gaussian_volume())
+
+        props = bpy.context.scene.blend_et_volume_render
+        props.numpy_sequence_path = str(series / "snap_*.npy")
+        props.numpy_workers = 2
+        self._configure_crop(self.gaussian_volume().shape)
+
+        self.assert_operator_finished(
+            bpy.ops.blend_et.volume_render_import_numpy_sequence()
+        )
+        volumes = [obj for obj in bpy.data.objects if obj.type == "VOLUME"]
+        self.assertEqual(1, len(volumes))
+        volume = volumes[0]
+        self.assertTrue(volume.data.is_sequence)
+        self.assertEqual(3, volume.data.frame_duration)
+        frames = Path(bpy.path.abspath(volume.data.filepath)).parent
+        self.assertEqual(3, len(list(frames.glob("*.vdb"))))
+        # the histogram covers the whole series
+        self.assertGreater(volume.active_material.volume_hist_vmax, 9.0)
+
+    def test_numpy_batch_import(self):
+        batch = self.workdir / "batch"
+        batch.mkdir(exist_ok=True)
+        for i in range(3):
+            np.save(batch / f"field_{i}.npy", (i + 1) * self.gaussian_volume())
+
+        props = bpy.context.scene.blend_et_volume_render
+        props.numpy_sequence_path = str(batch)
+        props.numpy_workers = 3
+        self._configure_crop(self.gaussian_volume().shape)
+
+        self.assert_operator_finished(
+            bpy.ops.blend_et.volume_render_import_numpy_batch()
+        )
+        volumes = [obj for obj in bpy.data.objects if obj.type == "VOLUME"]
+        self.assertEqual(3, len(volumes))
+        self.assertEqual(3, len({obj.data.filepath for obj in volumes}))
+        self.assertTrue(all(obj.active_material.volume_hist_ready for obj in volumes))
+
+    def test_vdb_histogram_is_cached(self):
+        data = self.gaussian_volume()
+        npy_path = self.workdir / "vdb_hist.npy"
+        np.save(npy_path, data)
+
+        props = bpy.context.scene.blend_et_volume_render
+        props.numpy_path = str(npy_path)
+        self._configure_crop(data.shape)
+        self.assert_operator_finished(bpy.ops.blend_et.volume_render_import_numpy())
+        generated_vdb = Path(
+            bpy.path.abspath(bpy.context.view_layer.objects.active.data.filepath)
+        )
+
+        props.vdb_path = str(generated_vdb)
+        self.assert_operator_finished(bpy.ops.blend_et.volume_render_import_vdb())
+        volume = bpy.context.view_layer.objects.active
+        self.assertFalse(volume.active_material.volume_hist_ready)
+
+        self.assert_operator_finished(
+            bpy.ops.blend_et.volume_render_compute_histogram()
+        )
+        self.assertTrue(volume.active_material.volume_hist_ready)
+        self.assertAlmostEqual(
+            float(data.max()), volume.active_material.volume_hist_vmax, places=5
+        )
+        self.assertTrue(Path(f"{generated_vdb}.stats.json").is_file())
+
+        self.assert_operator_finished(bpy.ops.blend_et.volume_render_import_vdb())
+        reimported = bpy.context.view_layer.objects.active
+        self.assertTrue(reimported.active_material.volume_hist_ready)
@@ -0,0 +1,70 @@
+import struct
+import zipfile
+
+import numpy as np
+
+
+def Npz_keys(path: str) -> list[str]:
+    """Lists the datasets of an ``.npz`` file without reading any of them."""
+    with zipfile.ZipFile(path) as zf:
+        return [n[: -len(".npy")] for n in zf.namelist() if n.endswith(".npy")]
+
+
+def _mmap_npz_member(path: str, key: str) -> np.ndarray | None:
+    """Memory-maps an uncompressed ``.npz`` member through its offset in the zip.
+
+    Returns None when the member cannot be mapped (compressed, object dtype, or
+    empty), in which case it has to be read the regular way.
+    """
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo(f"{key}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+
+    with open(path, "rb") as f:
+        # the local file header may differ from the central directory entry,
+        # so the data offset has to be taken from the header itself
+        f.seek(info.header_offset)
+        header = f.read(30)
+        if header[:4] != b"PK\x03\x04":
+            return None
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        else:
+            return None
+        offset = f.tell()
+
+    if dtype.hasobject or int(np.prod(shape)) == 0:
+        return None
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def Load_array(path: str, key: str | None = None) -> np.ndarray:
+    """Opens an array from a ``.npy`` file, or the ``key`` dataset of an ``.npz``.
+
+    Data is memory-mapped whenever the format allows it (``.npy`` files and
+    uncompressed ``.npz`` members), so slicing the result (e.g., to crop it)
+    only reads the selected region from disk. Compressed members are read in
+    full.
+    """
+    if path.lower().endswith(".npz"):
+        if key is None:
+            raise ValueError("A dataset key is required for .npz files")
+        if (arr := _mmap_npz_member(path, key)) is not None:
+            return arr
+        with np.load(path) as data:
+            return data[key]
+    return np.load(path, mmap_mode="r")
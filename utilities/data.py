@@ -1,9 +1,17 @@
 import bpy
-import bmesh
 import numpy as np
 from mathutils import Color
 
 
+def _fits_int32(v: list[float] | np.ndarray) -> bool:
+    if not (isinstance(v, np.ndarray) and np.issubdtype(v.dtype, np.integer)):
+        return False
+    if v.size == 0 or np.iinfo(v.dtype).bits <= 16:
+        return True
+    info = np.iinfo(np.int32)
+    return bool(v.min() >= info.min and v.max() <= info.max)
+
+
 def Encode_raw_data(
     data: dict[str, list[float] | np.ndarray],
     context: bpy.types.Context,
@@ -11,7 +19,11 @@ def Encode_raw_data(
     prefix: str = "",
     suffix: str = "",
 ) -> tuple[bpy.types.Object, bpy.types.Collection]:
-    """Encodes a dictionary of arrays as a mesh with point attributes."""
+    """Encodes a dictionary of arrays as a mesh with point attributes.
+
+    Integer NumPy arrays whose values fit in int32 are stored as INT attributes,
+    everything else (including wider integers, e.g. 64-bit IDs) as FLOAT.
+    """
     if (scene := context.scene) is None:
         raise RuntimeError("No active scene found")
 
@@ -45,19 +57,22 @@ def Encode_raw_data(
     obj = bpy.data.objects.new(f"{prefix}RawObj{suffix}", mesh)
     collection_.objects.link(obj)
 
-    bm = bmesh.new()
-
-    for i in range(npoints):
-        bm.verts.new((i * 0.1, 0.0, 0.0))
-    bm.verts.ensure_lookup_table()
-
-    bm.to_mesh(mesh)
-    bm.free()
+    # size the mesh once and fill every array with a single contiguous
+    # foreach_set; positions are only placeholders, the real coordinates live
+    # in the attributes
+    mesh.vertices.add(npoints)
+    co = np.zeros((npoints, 3), dtype=np.float32)
+    co[:, 0] = np.arange(npoints, dtype=np.float32) * 0.1
+    mesh.vertices.foreach_set("co", co.ravel())
 
     for k, v in data.items():
-        attr_k = mesh.attributes.new(name=k, type="FLOAT", domain="POINT")
-        for i in range(npoints):
-            attr_k.data[i].value = float(v[i])
+        if _fits_int32(v):
+            attr_k = mesh.attributes.new(name=k, type="INT", domain="POINT")
+            values = np.ascontiguousarray(v, dtype=np.int32)
+        else:
+            attr_k = mesh.attributes.new(name=k, type="FLOAT", domain="POINT")
+            values = np.ascontiguousarray(v, dtype=np.float32)
+        attr_k.data.foreach_set("value", values)
 
     mesh.update()
 
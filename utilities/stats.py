@@ -0,0 +1,184 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+# each display bin is resolved into this many sub-bins to locate quantiles
+_QUANTILE_SUBBINS = 512
+
+
+class Statistics(NamedTuple):
+    hist: np.ndarray
+    vmin: float
+    vmax: float
+    q05: float
+    q95: float
+
+
+def Array_chunks(
+    arr: np.ndarray, max_elements: int = 1 << 22
+) -> Callable[[], Iterator[np.ndarray]]:
+    """Returns a factory of slabs of ``arr`` along its first axis.
+
+    Each slab holds at most ~``max_elements`` values and is read (e.g., from a
+    memory map) only when iterated over. NaN/Inf are replaced with zeros.
+    """
+    step = max(1, max_elements // max(1, int(np.prod(arr.shape[1:]))))
+
+    def _chunks() -> Iterator[np.ndarray]:
+        for i in range(0, arr.shape[0], step):
+            yield np.nan_to_num(
+                np.asarray(arr[i : i + step], dtype=np.float32),
+                nan=0.0,
+                posinf=0.0,
+                neginf=0.0,
+            ).reshape(-1)
+
+    return _chunks
+
+
+def _map_chunks(
+    func: Callable[[np.ndarray], np.ndarray],
+    chunks: Iterable[np.ndarray],
+    workers: int,
+) -> Iterator[np.ndarray]:
+    """Applies ``func`` to every chunk in a thread pool.
+
+    At most ``2 * workers`` chunks are in flight, so memory stays bounded even
+    when the chunks are produced lazily.
+    """
+    if workers <= 1:
+        yield from map(func, chunks)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+class Histogram(NamedTuple):
+    counts: np.ndarray
+    vmin: float
+    vmax: float
+
+
+def Compute_histogram(
+    chunks: Callable[[], Iterable[np.ndarray]],
+    bins: int = 128,
+    workers: int = 1,
+    value_range: tuple[float, float] | None = None,
+) -> Histogram:
+    """Computes the value range and a ``bins * 512``-bin histogram over it.
+
+    ``chunks`` must yield finite 1D float chunks. Without ``value_range`` it is
+    called twice: the first pass finds the range, the second one fills the
+    histogram. Fixed bins over the exact range are what keep the quantiles
+    accurate to a sub-bin, and a single pass would have to re-bin whenever the
+    range grows. Callers that already know the range (e.g. gathered while
+    reading the data for another purpose) pass it to make a single pass. The
+    data is never materialized as a whole, and chunks may be processed in
+    parallel.
+    """
+
+    def _range(c: np.ndarray) -> np.ndarray:
+        if c.size == 0:
+            return np.array([np.inf, -np.inf])
+        return np.array([c.min(), c.max()], dtype=np.float64)
+
+    nfine = bins * _QUANTILE_SUBBINS
+    if value_range is not None:
+        vmin, vmax = value_range
+    else:
+        vmin, vmax = np.inf, -np.inf
+        for lo, hi in _map_chunks(_range, chunks(), workers):
+            vmin, vmax = min(vmin, lo), max(vmax, hi)
+    if vmin > vmax:
+        return Histogram(np.zeros(nfine, dtype=np.int64), 0.0, 1.0)
+    vmin, vmax = float(vmin), float(vmax)
+    if vmax == vmin:
+        vmax = vmin + 1e-12
+
+    scale = nfine / (vmax - vmin)
+
+    def _histogram(c: np.ndarray) -> np.ndarray:
+        idx = ((c.astype(np.float64) - vmin) * scale).astype(np.int64)
+        np.clip(idx, 0, nfine - 1, out=idx)
+        return np.bincount(idx, minlength=nfine)
+
+    counts = np.zeros(nfine, dtype=np.int64)
+    for c in _map_chunks(_histogram, chunks(), workers):
+        counts += c
+    return Histogram(counts, vmin, vmax)
+
+
+def Merge_histograms(histograms: Iterable[Histogram]) -> Histogram:
+    """Combines histograms over different ranges into one over their union.
+
+    Counts are moved to the bin containing the center of their original bin,
+    so the result is accurate to about one bin width of the inputs.
+    """
+    histograms = [h for h in histograms if h.counts.sum() > 0]
+    if not histograms:
+        return Histogram(np.zeros(128 * _QUANTILE_SUBBINS, dtype=np.int64), 0.0, 1.0)
+    nbins = max(h.counts.size for h in histograms)
+    vmin = min(h.vmin for h in histograms)
+    vmax = max(h.vmax for h in histograms)
+    scale = nbins / (vmax - vmin)
+    counts = np.zeros(nbins, dtype=np.float64)
+    for h in histograms:
+        width = (h.vmax - h.vmin) / h.counts.size
+        centers = h.vmin + (np.arange(h.counts.size) + 0.5) * width
+        idx = np.clip(((centers - vmin) * scale).astype(np.int64), 0, nbins - 1)
+        counts += np.bincount(idx, weights=h.counts, minlength=nbins)
+    return Histogram(np.rint(counts).astype(np.int64), vmin, vmax)
+
+
+def Histogram_statistics(histogram: Histogram, bins: int = 128) -> Statistics:
+    """Sums a histogram from ``Compute_histogram`` down to ``bins`` display bins
+    and interpolates the 5%/95% quantiles from its full resolution."""
+    counts, vmin, vmax = histogram
+    if counts.sum() == 0:
+        return Statistics(np.zeros(bins, dtype=np.int64), 0.0, 1.0, 0.0, 0.0)
+    return Statistics(
+        counts.reshape(bins, -1).sum(axis=1),
+        vmin,
+        vmax,
+        *Histogram_quantiles(counts, vmin, vmax, (0.05, 0.95)),
+    )
+
+
+def Compute_statistics(
+    chunks: Callable[[], Iterable[np.ndarray]],
+    bins: int = 128,
+    workers: int = 1,
+) -> Statistics:
+    """Computes min/max, a ``bins``-bin histogram and the 5%/95% quantiles.
+
+    The quantiles are interpolated from the ``bins * 512``-bin histogram of
+    ``Compute_histogram`` (accurate to a sub-bin width).
+    """
+    return Histogram_statistics(Compute_histogram(chunks, bins, workers), bins)
+
+
+def Histogram_quantiles(
+    hist: np.ndarray, vmin: float, vmax: float, quantiles: Iterable[float]
+) -> list[float]:
+    """Interpolates quantiles from a histogram with uniform bins over [vmin, vmax]."""
+    cdf = np.cumsum(hist, dtype=np.float64)
+    total = cdf[-1] if cdf.size else 0.0
+    if total <= 0:
+        return [vmin for _ in quantiles]
+    width = (vmax - vmin) / hist.size
+    result = []
+    for q in quantiles:
+        target = q * total
+        i = min(int(np.searchsorted(cdf, target, side="left")), hist.size - 1)
+        below = cdf[i - 1] if i > 0 else 0.0
+        frac = (target - below) / hist[i] if hist[i] > 0 else 0.0
+        result.append(float(vmin + (i + frac) * width))
+    return result
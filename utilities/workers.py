@@ -0,0 +1,159 @@
+import importlib
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
+import types
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any
+
+_ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_WORKER_PACKAGE = "blend_et_worker"
+_SYS_PATH_VAR = "BLEND_ET_SYS_PATH"
+
+# workers load this file by path: running it as a script would put
+# ``utilities/`` first on ``sys.path`` and shadow the stdlib ``types`` module.
+# The parent's module paths (Blender's user and add-on module directories,
+# where e.g. pyopenvdb may be installed) are appended after the worker's own.
+_BOOTSTRAP = (
+    "import importlib.util, os, sys\n"
+    f"for p in os.environ.get({_SYS_PATH_VAR!r}, '').split(os.pathsep):\n"
+    "    if p and p not in sys.path:\n"
+    "        sys.path.append(p)\n"
+    "spec = importlib.util.spec_from_file_location('_worker', sys.argv[1])\n"
+    "module = importlib.util.module_from_spec(spec)\n"
+    "spec.loader.exec_module(module)\n"
+    "module._run_job(*sys.argv[2:])\n"
+)
+
+
+class WorkerPool:
+    """Runs ``module.function(**kwargs)`` jobs in separate processes.
+
+    ``module`` is given relative to the add-on root (e.g. ``"fieldlines.tracing"``)
+    and must not import ``bpy``: workers run in Blender's bundled interpreter
+    (``sys.executable``), where only the NumPy side of the add-on is importable.
+    Arguments and results are exchanged through pickle files, so large arrays
+    should be passed as paths to memory-mappable ``.npy`` files instead, and
+    results should only contain builtin and NumPy types.
+
+    At most ``max_workers`` processes run at once; ``submit`` returns a future,
+    so results can be polled (e.g. from a modal operator) as jobs finish.
+    """
+
+    def __init__(self, module: str, function: str, max_workers: int):
+        self.module = module
+        self.function = function
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="blend_et_")
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        self._procs: set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._count = 0
+
+    def submit(self, **kwargs: Any) -> Future:
+        self._count += 1
+        return self._executor.submit(self._run, self._count, kwargs)
+
+    def _run(self, i: int, kwargs: dict[str, Any]) -> Any:
+        args_path = os.path.join(self._tmpdir.name, f"job_{i}.args.pkl")
+        result_path = os.path.join(self._tmpdir.name, f"job_{i}.result.pkl")
+        with open(args_path, "wb") as f:
+            pickle.dump(kwargs, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._cancelled:
+                raise CancelledError()
+            proc = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-c",
+                    _BOOTSTRAP,
+                    os.path.abspath(__file__),
+                    _ADDON_ROOT,
+                    self.module,
+                    self.function,
+                    args_path,
+                    result_path,
+                ],
+                cwd=self._tmpdir.name,
+                env={**os.environ, _SYS_PATH_VAR: os.pathsep.join(sys.path)},
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+            self._procs.add(proc)
+        try:
+            _, stderr = proc.communicate()
+        finally:
+            with self._lock:
+                self._procs.discard(proc)
+        if self._cancelled:
+            raise CancelledError()
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"Worker {i} failed with exit code {proc.returncode}:\n"
+                + stderr.strip()[-2000:]
+            )
+        with open(result_path, "rb") as f:
+            return pickle.load(f)
+
+    def shutdown(self, cancel: bool = False) -> None:
+        """Waits for the submitted jobs, or kills them with ``cancel``, and
+        removes the exchange files."""
+        if cancel:
+            with self._lock:
+                self._cancelled = True
+                for proc in self._procs:
+                    proc.kill()
+        self._executor.shutdown(wait=True, cancel_futures=cancel)
+        self._tmpdir.cleanup()
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, exc_type, *_) -> None:
+        self.shutdown(cancel=exc_type is not None)
+
+
+def Run_in_subprocesses(
+    module: str,
+    function: str,
+    jobs: list[dict[str, Any]],
+    max_workers: int,
+) -> list[Any]:
+    """Calls ``module.function(**kwargs)`` for every job in separate processes
+    (see ``WorkerPool``) and returns the results in job order."""
+    with WorkerPool(module, function, max_workers) as pool:
+        futures = [pool.submit(**job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def _import_detached(root: str, module: str) -> types.ModuleType:
+    """Imports ``module`` from the add-on without running any package ``__init__``.
+
+    The add-on directory and its subpackages are mounted as bare namespace
+    modules, so relative imports between bpy-free modules keep working.
+    """
+    package = types.ModuleType(_WORKER_PACKAGE)
+    package.__path__ = [root]
+    sys.modules[_WORKER_PACKAGE] = package
+    for entry in os.listdir(root):
+        path = os.path.join(root, entry)
+        if os.path.isfile(os.path.join(path, "__init__.py")):
+            subpackage = types.ModuleType(f"{_WORKER_PACKAGE}.{entry}")
+            subpackage.__path__ = [path]
+            sys.modules[subpackage.__name__] = subpackage
+    return importlib.import_module(f"{_WORKER_PACKAGE}.{module}")
+
+
+def _run_job(
+    root: str, module: str, function: str, args_path: str, result_path: str
+) -> None:
+    with open(args_path, "rb") as f:
+        kwargs = pickle.load(f)
+    result = getattr(_import_detached(root, module), function)(**kwargs)
+    with open(result_path, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
@@ -9,14 +9,22 @@ def classes():
         VolumeMaterial_ReverseColormap,
         VolumeMaterial_CreateOrReset,
         Volume_ImportVDB,
+        Volume_ComputeHistogram,
         Volume_ImportNumpy,
+        Volume_ImportNumpyBatch,
+        Volume_ImportNumpySequence,
+        Volume_PruneCache,
     )
     from .ui import BLENDET_PT_volume_material_nde, BLENDET_PT_volume_3dv
 
     return (
         Volume_Props,
         Volume_ImportVDB,
+        Volume_ComputeHistogram,
         Volume_ImportNumpy,
+        Volume_ImportNumpyBatch,
+        Volume_ImportNumpySequence,
+        Volume_PruneCache,
         VolumeMaterial_ReverseColormap,
         VolumeMaterial_CreateOrReset,
         BLENDET_PT_volume_3dv,
@@ -25,7 +33,8 @@ def classes():
 
 
 def register():
-    from .props import Volume_Props, VolumeMaterial_Props
+    from .props import Volume_Props, VolumeMaterial_Props, VolumeData_Props
+    from .utils import Use_full_resolution_for_render, Restore_preview_levels
 
     for cls in classes():
         bpy.utils.register_class(cls)
@@ -35,11 +44,26 @@ def register():
     )
 
     VolumeMaterial_Props.register()
+    VolumeData_Props.register()
 
+    bpy.app.handlers.render_pre.append(Use_full_resolution_for_render)
+    bpy.app.handlers.render_complete.append(Restore_preview_levels)
+    bpy.app.handlers.render_cancel.append(Restore_preview_levels)
 
-def unregister():
-    from .props import VolumeMaterial_Props
 
+def unregister():
+    from .props import VolumeMaterial_Props, VolumeData_Props
+    from .utils import Use_full_resolution_for_render, Restore_preview_levels
+
+    for handlers, handler in (
+        (bpy.app.handlers.render_pre, Use_full_resolution_for_render),
+        (bpy.app.handlers.render_complete, Restore_preview_levels),
+        (bpy.app.handlers.render_cancel, Restore_preview_levels),
+    ):
+        if handler in handlers:
+            handlers.remove(handler)
+
+    VolumeData_Props.unregister()
     VolumeMaterial_Props.unregister()
 
     del bpy.types.Scene.blend_et_volume_render
@@ -51,8 +75,10 @@ def unregister():
 if _needs_reload:
     import importlib
 
-    from . import utils, props, operators, ui
+    from . import cache, conversion, utils, props, operators, ui
 
+    importlib.reload(cache)
+    importlib.reload(conversion)
     importlib.reload(utils)
     importlib.reload(props)
     importlib.reload(operators)
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+from typing import Any
+
+import numpy as np
+
+from ..utilities.stats import Statistics
+
+CACHE_DIRNAME = "BlendET_cache"
+
+_MIP_SUFFIX = re.compile(r"\.mip\d+\.vdb$")
+
+
+def Cache_key(source_paths: list[str], **params: Any) -> str:
+    """Hashes the identity of source files together with the conversion parameters.
+
+    Files are identified by their absolute path, size and modification time, so
+    editing (or replacing) a source invalidates its cached conversions.
+    """
+    sources = []
+    for path in source_paths:
+        st = os.stat(path)
+        sources.append(
+            {
+                "path": os.path.normcase(os.path.abspath(path)),
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+            }
+        )
+    identity = {"sources": sources, "params": params}
+    blob = json.dumps(identity, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def _sidecar_path(vdb_path: str) -> str:
+    # sequences are cached as directories of frames
+    if os.path.isdir(vdb_path):
+        return vdb_path + ".json"
+    return os.path.splitext(vdb_path)[0] + ".json"
+
+
+def _size(path: str) -> int:
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
+
+
+def Mip_path(vdb_path: str, factor: int) -> str:
+    """Path of the ``factor``-times downsampled level stored next to a cached volume."""
+    return os.path.splitext(vdb_path)[0] + f".mip{factor}.vdb"
+
+
+def _read_statistics(meta_path: str) -> tuple[Statistics, dict] | None:
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        stats = Statistics(
+            np.asarray(meta["hist"], dtype=np.int64),
+            float(meta["vmin"]),
+            float(meta["vmax"]),
+            float(meta["q05"]),
+            float(meta["q95"]),
+        )
+    except (OSError, ValueError, KeyError):
+        return None
+    return stats, meta
+
+
+def _write_statistics(meta_path: str, stats: Statistics, **extra: Any) -> None:
+    meta = {
+        "hist": np.asarray(stats.hist).tolist(),
+        "vmin": stats.vmin,
+        "vmax": stats.vmax,
+        "q05": stats.q05,
+        "q95": stats.q95,
+        **extra,
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+
+
+def Load_cached(vdb_path: str) -> Statistics | None:
+    """Returns the statistics stored next to a cached ``.vdb`` (or directory of
+    frames), or None on a miss.
+
+    A hit refreshes the entry's modification time, which drives the eviction.
+    """
+    meta_path = _sidecar_path(vdb_path)
+    if not (os.path.exists(vdb_path) and os.path.isfile(meta_path)):
+        return None
+    if (cached := _read_statistics(meta_path)) is None:
+        return None
+    os.utime(vdb_path)
+    os.utime(meta_path)
+    return cached[0]
+
+
+def Store_cached(vdb_path: str, stats: Statistics, **extra: Any) -> None:
+    """Writes the statistics of a freshly converted ``.vdb`` to its sidecar file."""
+    _write_statistics(_sidecar_path(vdb_path), stats, **extra)
+
+
+def _vdb_identity(vdb_path: str, grid_name: str) -> dict[str, Any]:
+    st = os.stat(vdb_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "grid": grid_name}
+
+
+def Load_vdb_statistics(vdb_path: str, grid_name: str = "") -> Statistics | None:
+    """Returns the statistics of a grid of any ``.vdb`` from its sidecar file
+    (``<file>.vdb.stats.json``), or None when missing or out of date."""
+    meta_path = f"{vdb_path}.stats.json"
+    if not os.path.isfile(meta_path) or (cached := _read_statistics(meta_path)) is None:
+        return None
+    stats, meta = cached
+    if meta.get("source") != _vdb_identity(vdb_path, grid_name):
+        return None
+    return stats
+
+
+def Store_vdb_statistics(vdb_path: str, stats: Statistics, grid_name: str = "") -> None:
+    """Writes the statistics of a grid next to its ``.vdb``, keyed on the file's
+    size and modification time."""
+    _write_statistics(
+        f"{vdb_path}.stats.json",
+        stats,
+        source=_vdb_identity(vdb_path, grid_name),
+    )
+
+
+def _cache_entries(cache_dir: str) -> list[tuple[float, int, list[str]]]:
+    """Returns (last use, size in bytes, files) for every volume in the cache.
+
+    The files of an entry are its ``.vdb`` (or directory of frames), the sidecar
+    and the downsampled levels.
+    """
+    if not os.path.isdir(cache_dir):
+        return []
+    cache_dir = os.path.abspath(cache_dir)
+    names = os.listdir(cache_dir)
+    entries = []
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        is_volume = name.endswith(".vdb") and not _MIP_SUFFIX.search(name)
+        if not (is_volume or os.path.isdir(path)):
+            continue
+        files = [path]
+        if os.path.isfile(meta := _sidecar_path(files[0])):
+            files.append(meta)
+        stem = os.path.splitext(name)[0]
+        files += [
+            os.path.join(cache_dir, n)
+            for n in names
+            if n.startswith(f"{stem}.mip") and _MIP_SUFFIX.search(n)
+        ]
+        try:
+            sizes = [_size(f) for f in files]
+            mtime = os.path.getmtime(files[0])
+        except OSError:
+            continue
+        entries.append((mtime, sum(sizes), files))
+    return entries
+
+
+def Cache_usage(cache_dir: str) -> tuple[int, int]:
+    """Returns the number of cached volumes and their total size in bytes."""
+    entries = _cache_entries(cache_dir)
+    return len(entries), sum(size for _, size, _ in entries)
+
+
+def Prune_cache(
+    cache_dir: str, max_bytes: int, keep: set[str] | None = None
+) -> tuple[int, int]:
+    """Evicts the least recently used volumes until the cache fits in ``max_bytes``.
+
+    Entries containing any of the files in ``keep`` are never removed. Returns
+    the number of removed volumes and the freed bytes.
+    """
+    keep = {os.path.abspath(p) for p in (keep or set())}
+    entries = sorted(_cache_entries(cache_dir))
+    total = sum(size for _, size, _ in entries)
+    removed, freed = 0, 0
+    for _, size, files in entries:
+        if total - freed <= max_bytes:
+            break
+        if any(k == f or k.startswith(f + os.sep) for k in keep for f in files):
+            continue
+        try:
+            for f in files:
+                if os.path.isdir(f):
+                    shutil.rmtree(f)
+                else:
+                    os.remove(f)
+        except OSError:
+            continue
+        removed += 1
+        freed += size
+    return removed, freed
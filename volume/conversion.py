@@ -0,0 +1,423 @@
+import glob
+import itertools
+import os
+import re
+from collections.abc import Callable, Iterator
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from ..utilities.arrays import Load_array, Npz_keys
+from ..utilities.stats import (
+    Array_chunks,
+    Compute_histogram,
+    Compute_statistics,
+    Histogram,
+    Histogram_statistics,
+    Statistics,
+)
+
+# transpose that brings an array with the given axis order to (Z, Y, X)
+AXIS_ORDERS: dict[str, tuple[int, int, int]] = {
+    "ZYX": (0, 1, 2),
+    "XYZ": (2, 1, 0),
+    "YZX": (1, 2, 0),
+    "ZXY": (0, 2, 1),
+    "XZY": (2, 0, 1),
+    "YXZ": (1, 0, 2),
+}
+
+
+def Prepare_volume_array(arr: np.ndarray, axis_order: str = "ZYX") -> np.ndarray:
+    """Converts an array to the C-contiguous float32 (X, Y, Z) layout of openvdb.
+
+    The data is copied once, slab by slab, straight into the output buffer, and
+    NaN/Inf are zeroed in place, so peak memory stays close to the size of the
+    float32 result (the input may be a memory-mapped view).
+    """
+    axes = AXIS_ORDERS.get(axis_order, (0, 1, 2))
+    view = np.transpose(arr, axes).T
+    out = np.empty(view.shape, dtype=np.float32)
+    # walk the slabs along the slowest axis of the input, so that a
+    # memory-mapped source is read sequentially
+    slab_axis = axes[::-1].index(0)
+    out_slabs = np.moveaxis(out, slab_axis, 0)
+    view_slabs = np.moveaxis(view, slab_axis, 0)
+    for i in range(out_slabs.shape[0]):
+        np.copyto(out_slabs[i], view_slabs[i], casting="unsafe")
+        np.nan_to_num(out_slabs[i], copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    return out
+
+
+def Block_mean(arr: np.ndarray, factor: int) -> np.ndarray:
+    """Downsamples an array by averaging blocks of ``factor`` voxels per axis.
+
+    Trailing partial blocks are averaged over the voxels they contain.
+    """
+    out = arr
+    for axis in range(arr.ndim):
+        n = out.shape[axis]
+        starts = np.arange(0, n, factor)
+        counts = np.diff(np.append(starts, n)).astype(np.float32)
+        shape = [1] * arr.ndim
+        shape[axis] = -1
+        out = np.add.reduceat(out, starts, axis=axis, dtype=np.float32)
+        out /= counts.reshape(shape)
+    return out
+
+
+def Mip_matrix(factor: int) -> list[list[float]]:
+    """Index-to-world matrix of a level downsampled with ``Block_mean``.
+
+    Voxels are ``factor`` times larger and centered on the blocks they average,
+    so every level covers the same region as the full-resolution grid.
+    """
+    shift = (factor - 1) / 2
+    return [
+        [factor, 0.0, 0.0, 0.0],
+        [0.0, factor, 0.0, 0.0],
+        [0.0, 0.0, factor, 0.0],
+        [shift, shift, shift, 1.0],
+    ]
+
+
+def Copy_mip_levels(
+    mip_grids: dict[int, Any],
+    arr: np.ndarray,
+    offset: tuple[int, int, int] = (0, 0, 0),
+    tolerance: float = 0.0,
+) -> None:
+    """Copies the downsampled levels of an (X, Y, Z) array into their grids.
+
+    ``mip_grids`` maps increasing downsampling factors to openvdb grids; every
+    level is computed from the previous one. ``offset`` must be a multiple of
+    the largest factor.
+    """
+    level, previous = arr, 1
+    for factor in sorted(mip_grids):
+        level = Block_mean(level, factor // previous)
+        previous = factor
+        ijk = tuple(o // factor for o in offset)
+        mip_grids[factor].copyFromArray(level, ijk=ijk, tolerance=tolerance)
+
+
+def Brick_shape(shape: tuple[int, ...], max_elements: int) -> tuple[int, ...]:
+    """Picks the largest brick of ``shape`` holding at most ``max_elements`` values.
+
+    Bricks span the fast (trailing) axes in full whenever possible, so that a
+    memory-mapped source is read in long contiguous runs, and are cut along
+    the slow axes in multiples of 8 to line up with VDB leaf nodes.
+    """
+    brick = list(shape)
+    for axis in range(len(brick)):
+        if int(np.prod(brick)) <= max_elements:
+            break
+        rest = int(np.prod(brick)) // brick[axis]
+        brick[axis] = min(brick[axis], max(8, max_elements // rest // 8 * 8))
+    return tuple(brick)
+
+
+def Volume_bricks(
+    arr: np.ndarray, axis_order: str = "ZYX", max_bytes: int = 256 << 20
+) -> Iterator[tuple[tuple[int, int, int], np.ndarray]]:
+    """Yields ``(ijk offset, brick)`` pairs covering a (memory-mapped) array.
+
+    Every brick is converted with ``Prepare_volume_array`` and holds at most
+    ~``max_bytes`` of float32 data, so the whole array is never in memory.
+    """
+    axes = AXIS_ORDERS.get(axis_order, (0, 1, 2))
+    # source axis that ends up as the X, Y and Z axis of the grid
+    xyz_axes = axes[::-1]
+    brick = Brick_shape(arr.shape, max(1, max_bytes // 4))
+    for start in itertools.product(*(range(0, n, b) for n, b in zip(arr.shape, brick))):
+        region = tuple(slice(s, s + b) for s, b in zip(start, brick))
+        offset = tuple(start[a] for a in xyz_axes)
+        yield offset, Prepare_volume_array(arr[region], axis_order)
+
+
+def Copy_bricks_to_grid(
+    grid: Any,
+    arr: np.ndarray,
+    axis_order: str = "ZYX",
+    tolerance: float = 0.0,
+    max_bytes: int = 256 << 20,
+    mip_grids: dict[int, Any] | None = None,
+    progress: Callable[[float], None] | None = None,
+) -> tuple[int, float, float]:
+    """Copies an array into an openvdb grid brick by brick.
+
+    Bricks whose values all lie within ``tolerance`` of the grid's background
+    are skipped. The downsampled levels in ``mip_grids`` (see
+    ``Copy_mip_levels``), if any, are filled from the same bricks. ``progress``
+    is called with the fraction of bricks done. Returns the number of skipped
+    bricks and the value range of the whole array, so that it does not have
+    to be read again to find it.
+    """
+    brick = Brick_shape(arr.shape, max(1, max_bytes // 4))
+    total = int(np.prod([-(-n // b) for n, b in zip(arr.shape, brick)]))
+    background = grid.background
+    skipped = 0
+    vmin, vmax = np.inf, -np.inf
+    for i, (offset, brick) in enumerate(Volume_bricks(arr, axis_order, max_bytes)):
+        if brick.size:
+            vmin = min(vmin, float(brick.min()))
+            vmax = max(vmax, float(brick.max()))
+        if np.all(np.abs(brick - background) <= tolerance):
+            skipped += 1
+        else:
+            grid.copyFromArray(brick, ijk=offset, tolerance=tolerance)
+            if mip_grids:
+                Copy_mip_levels(mip_grids, brick, offset, tolerance)
+        if progress is not None:
+            progress((i + 1) / total)
+    return skipped, vmin, vmax
+
+
+class Conversion(NamedTuple):
+    histogram: Histogram
+    active_fraction: float
+    skipped_bricks: int
+
+
+def Import_openvdb() -> Any:
+    """Returns the openvdb Python module, under either of its names."""
+    try:
+        import pyopenvdb as vdb  # type: ignore
+    except ImportError:
+        import openvdb as vdb  # type: ignore
+    return vdb
+
+
+def Load_volume_array(
+    path: str,
+    npz_key: str = "",
+    crop: tuple[int, int, int, int, int, int] = (0, -1, 0, -1, 0, -1),
+) -> np.ndarray:
+    """Opens (memory-maps, when possible) and crops a 3D array from .npy/.npz.
+
+    Raises ValueError with a user-facing message when the input is unusable.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        arr = Load_array(path)
+    elif ext == ".npz":
+        files = Npz_keys(path)
+        if not npz_key:
+            raise ValueError(f"NPZ datasets: {files} — set 'NPZ field'.")
+        if npz_key not in files:
+            raise ValueError(f"'{npz_key}' not in NPZ datasets: {files}")
+        arr = Load_array(path, npz_key)
+    else:
+        raise ValueError("File must be .npy or .npz")
+
+    if arr.ndim == 2:
+        arr = arr[None, ...]  # treat as single slice: Z=1
+    if arr.ndim != 3:
+        raise ValueError(f"Array must be 3D (got shape {arr.shape})")
+    xmin, xmax, ymin, ymax, zmin, zmax = crop
+    arr = arr[xmin:xmax, ymin:ymax, zmin:zmax]
+    if arr.size == 0:
+        raise ValueError("Cropped array is empty.")
+    return arr
+
+
+def Convert_numpy_to_vdb(
+    source_path: str,
+    vdb_path: str,
+    npz_key: str = "",
+    crop: tuple[int, int, int, int, int, int] = (0, -1, 0, -1, 0, -1),
+    **kwargs: Any,
+) -> Conversion:
+    """Converts a cropped .npy/.npz array into a ``density`` grid written to
+    ``vdb_path``; the other options are those of ``Convert_array_to_vdb``."""
+    Import_openvdb()
+    arr = Load_volume_array(source_path, npz_key, crop)
+    return Convert_array_to_vdb(arr, vdb_path, **kwargs)
+
+
+def Convert_array_to_vdb(
+    arr: np.ndarray,
+    vdb_path: str,
+    axis_order: str = "ZYX",
+    background: float = 0.0,
+    tolerance: float = 0.0,
+    mip_paths: dict[int, str] | None = None,
+    max_bytes: int = 0,
+    bins: int = 128,
+    workers: int = 1,
+    progress: Callable[[float], None] | None = None,
+) -> Conversion:
+    """Converts a 3D array into a ``density`` grid written to ``vdb_path``.
+
+    Downsampled levels are written to ``mip_paths`` ({factor: path}), and with
+    a positive ``max_bytes`` the array (e.g., memory-mapped) is converted
+    out-of-core, in bricks of at most that size. Files are written under a
+    temporary name and renamed when complete; the full resolution goes last.
+
+    ``progress`` is called with the completed fraction along the way; an
+    exception raised from it aborts the conversion (e.g., to cancel it) and
+    removes the files written so far.
+    """
+    vdb = Import_openvdb()
+    mip_paths = mip_paths or {}
+
+    def _report(fraction: float) -> None:
+        if progress is not None:
+            progress(fraction)
+
+    def _tracked(chunks, lo: float, hi: float, passes: int = 2):
+        # progress over the passes of Compute_histogram
+        done = 0
+
+        def _chunks():
+            nonlocal done
+            for c in chunks():
+                yield c
+                done += c.size
+                _report(lo + (hi - lo) * done / (passes * nvoxels))
+
+        return _chunks
+
+    def _grid(factor: int = 1) -> Any:
+        grid = vdb.FloatGrid(background)
+        grid.name = "density"
+        if factor > 1:
+            # voxels are scaled to span the same region as the full resolution
+            grid.transform = vdb.createLinearTransform(Mip_matrix(factor))
+        return grid
+
+    grid = _grid()
+    mip_grids = {f: _grid(f) for f in sorted(mip_paths)}
+    nvoxels = arr.size
+    skipped = 0
+    if max_bytes > 0:
+        # the source stays memory-mapped: the grids and the histogram are
+        # both built from bricks of at most the given budget, and the value
+        # range found while copying the bricks lets the histogram take a
+        # single pass, so the source is read twice
+        skipped, vmin, vmax = Copy_bricks_to_grid(
+            grid,
+            arr,
+            axis_order,
+            tolerance,
+            max_bytes,
+            mip_grids,
+            progress=lambda f: _report(0.5 * f),
+        )
+        histogram = Compute_histogram(
+            _tracked(
+                Array_chunks(arr, max_elements=max_bytes // 4), 0.5, 0.9, passes=1
+            ),
+            bins,
+            workers,
+            value_range=(vmin, vmax) if vmin <= vmax else None,
+        )
+    else:
+        arr = Prepare_volume_array(arr, axis_order)
+        _report(0.2)
+        histogram = Compute_histogram(
+            _tracked(Array_chunks(arr), 0.2, 0.5), bins, workers
+        )
+        # voxels within the tolerance of the background become inactive and
+        # are collapsed into tiles
+        grid.copyFromArray(arr, tolerance=tolerance)
+        _report(0.7)
+        Copy_mip_levels(mip_grids, arr, tolerance=tolerance)
+        _report(0.8)
+    del arr
+
+    outputs = [(mip_paths[f], mip_grids[f]) for f in mip_grids]
+    outputs.append((vdb_path, grid))
+    written = []
+    try:
+        for i, (out_path, out_grid) in enumerate(outputs):
+            out_grid.prune(tolerance=tolerance)
+            tmp_path = f"{out_path}.partial"
+            try:
+                vdb.write(tmp_path, grids=[out_grid])
+                os.replace(tmp_path, out_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            written.append(out_path)
+            if i + 1 < len(outputs):
+                _report(0.9 + 0.1 * (i + 1) / len(outputs))
+    except BaseException:
+        # never leave an incomplete set of levels behind
+        for out_path in written:
+            os.remove(out_path)
+        raise
+    return Conversion(histogram, grid.activeVoxelCount() / nvoxels, skipped)
+
+
+def Convert_frame(**kwargs: Any) -> tuple[np.ndarray, float, float, float]:
+    """``Convert_numpy_to_vdb`` for worker processes: returns plain data only
+    (histogram counts, range and active fraction), which unpickles anywhere."""
+    histogram, active_fraction, _ = Convert_numpy_to_vdb(**kwargs)
+    return histogram.counts, histogram.vmin, histogram.vmax, active_fraction
+
+
+def Vdb_statistics(
+    vdb_path: str,
+    grid_name: str = "",
+    bins: int = 128,
+    workers: int = 1,
+    max_bytes: int = 64 << 20,
+) -> Statistics:
+    """Computes the statistics of the active values of a float grid of a
+    ``.vdb`` file (the first one when ``grid_name`` is empty).
+
+    The active bounding box is copied out of the grid in slabs of at most
+    ``max_bytes``, so only the sparse grid and one slab are ever in memory. The
+    inactive voxels of the box hold the background value, so they are taken
+    back out of the background's bin afterwards. The value range comes from
+    the grid itself, so the slabs are read once.
+    """
+    vdb = Import_openvdb()
+    grid = vdb.read(vdb_path, grid_name) if grid_name else vdb.readAll(vdb_path)[0][0]
+    if (nactive := grid.activeVoxelCount()) == 0:
+        return Compute_statistics(lambda: iter(()), bins)
+    (x0, y0, z0), (x1, y1, z1) = grid.evalActiveVoxelBoundingBox()
+    nx, ny, nz = x1 - x0 + 1, y1 - y0 + 1, z1 - z0 + 1
+    step = max(1, max_bytes // 4 // (ny * nz))
+
+    def _clean(values: np.ndarray) -> np.ndarray:
+        return np.nan_to_num(values, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+    def _chunks() -> Iterator[np.ndarray]:
+        for x in range(x0, x1 + 1, step):
+            slab = np.empty((min(step, x1 + 1 - x), ny, nz), dtype=np.float32)
+            grid.copyToArray(slab, ijk=(x, y0, z0))
+            yield _clean(slab).reshape(-1)
+
+    vmin, vmax = grid.evalMinMax()
+    value_range = None
+    if np.isfinite(vmin) and np.isfinite(vmax):
+        value_range = (float(vmin), float(vmax))
+    counts, vmin, vmax = Compute_histogram(
+        _chunks, bins, workers, value_range=value_range
+    )
+    # same binning as Compute_histogram; a background outside the active
+    # range was clipped into an edge bin
+    background = float(_clean(np.float32([grid.background]))[0])
+    counts = counts.copy()
+    i = int((background - vmin) * counts.size / (vmax - vmin))
+    counts[min(max(i, 0), counts.size - 1)] -= nx * ny * nz - nactive
+    return Histogram_statistics(Histogram(counts, vmin, vmax), bins)
+
+
+def _natural_key(path: str) -> list[Any]:
+    return [int(t) if t.isdigit() else t for t in re.split(r"(\d+)", path)]
+
+
+def Sequence_paths(pattern: str) -> list[str]:
+    """Lists the .npy/.npz files of a directory or a glob pattern in natural
+    order (``snap_2`` before ``snap_10``)."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*")
+    paths = [
+        p
+        for p in glob.glob(pattern)
+        if os.path.isfile(p) and os.path.splitext(p)[1].lower() in (".npy", ".npz")
+    ]
+    return sorted(paths, key=_natural_key)
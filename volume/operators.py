@@ -1,9 +1,30 @@
 import bpy
 
-import numpy as np
-
 import os
-
+import re
+import shutil
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from .cache import (
+    CACHE_DIRNAME,
+    Cache_key,
+    Cache_usage,
+    Load_cached,
+    Load_vdb_statistics,
+    Mip_path,
+    Prune_cache,
+    Store_cached,
+    Store_vdb_statistics,
+)
+from .conversion import (
+    Conversion,
+    Convert_numpy_to_vdb,
+    Import_openvdb,
+    Sequence_paths,
+    Vdb_statistics,
+)
 from .utils import (
     Create_or_reset_volume_material,
     Create_volume_object,
@@ -14,7 +35,114 @@ from .utils import (
 from ..utilities.materials import (
     CommonMaterialReverseColormap,
 )
+from ..utilities.stats import (
+    Histogram,
+    Histogram_statistics,
+    Merge_histograms,
+    Statistics,
+)
 from ..utilities.types import OperatorReturnItems
+from ..utilities.workers import Run_in_subprocesses, WorkerPool
+
+
+def _cache_dir_for(path: str) -> str:
+    directory = os.path.dirname(path)
+    blend_dir = directory if os.path.isabs(path) else os.path.dirname(bpy.data.filepath)
+    return os.path.join(blend_dir, CACHE_DIRNAME)
+
+
+def _conversion_settings(props, path: str) -> dict:
+    """Conversion options shared by the numpy imports (and their cache keys)."""
+    return {
+        "npz_key": props.npz_key.strip() if path.lower().endswith(".npz") else "",
+        "crop": (
+            props.numpy_crop_xmin,
+            props.numpy_crop_xmax,
+            props.numpy_crop_ymin,
+            props.numpy_crop_ymax,
+            props.numpy_crop_zmin,
+            props.numpy_crop_zmax,
+        ),
+        "axis_order": props.numpy_axis_order,
+        "background": props.vdb_background,
+        "tolerance": props.vdb_tolerance,
+    }
+
+
+class _ImportCancelled(Exception):
+    pass
+
+
+def _brick_budget(props) -> int:
+    """Brick size of the out-of-core conversion in bytes (0: in memory)."""
+    return (props.numpy_brick_budget << 20) if props.numpy_tiled else 0
+
+
+def _numpy_cache_paths(props, path: str) -> tuple[str, dict[int, str], dict]:
+    """Returns the cached .vdb and preview levels for ``path`` converted with
+    the current settings, and those settings."""
+    settings = _conversion_settings(props, path)
+    # Output file under same directory in 'BlendET_cache', named after a hash
+    # of the source and the conversion settings so re-imports can reuse it
+    cache_dir = _cache_dir_for(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    base = os.path.splitext(os.path.basename(path))[0]
+    if settings["npz_key"]:
+        base += f"_{settings['npz_key']}"
+    vdb_path = os.path.join(cache_dir, f"{base}_{Cache_key([path], **settings)}.vdb")
+    mip_paths = {f: Mip_path(vdb_path, f) for f in [2, 4, 8][: props.numpy_mip_levels]}
+    return vdb_path, mip_paths, settings
+
+
+def _load_cached_volume(props, vdb_path: str, mip_paths: dict[int, str]):
+    if not props.use_cache or not all(map(os.path.isfile, mip_paths.values())):
+        return None
+    return Load_cached(vdb_path)
+
+
+def _create_numpy_volume(
+    context: bpy.types.Context,
+    props,
+    vdb_path: str,
+    mip_paths: dict[int, str],
+    stats: Statistics,
+) -> str:
+    """Creates the volume object of a converted array and returns its name."""
+    uuid_str = f"{props.uuid:04d}"
+    props.uuid += 1
+
+    def _store(p: str) -> str:
+        return bpy.path.relpath(p) if props.save_relative else p
+
+    vol_name, _, mat = Create_volume_object(
+        context, _store(vdb_path), vdb_path, uuid_str
+    )
+
+    if mip_paths and (vol_obj := context.view_layer.objects.active) is not None:
+        levels = {"1": _store(vdb_path)}
+        for f, mip_path in mip_paths.items():
+            levels[str(f)] = _store(mip_path)
+        vol_obj.data["blend_et_levels"] = levels
+        vol_obj.data.blend_et_preview_level = str(max(mip_paths))
+
+    if mat is not None:
+        Store_histogram_on_material(mat, stats)
+    return vol_name
+
+
+def _active_grid_name(vol: bpy.types.Volume) -> str:
+    try:
+        vol.grids.load()
+        if (grid := vol.grids.active) is not None:
+            return grid.name
+    except Exception:
+        pass
+    return ""
+
+
+def _volume_files_in_use() -> set[str]:
+    # cached volumes still referenced by the .blend are never evicted
+    return {bpy.path.abspath(v.filepath) for v in bpy.data.volumes if v.filepath}
 
 
 class VolumeMaterial_ReverseColormap(bpy.types.Operator):
@@ -84,177 +212,508 @@ class Volume_ImportVDB(bpy.types.Operator):
         )
 
         if mat is not None:
-            Clear_histogram_on_material(mat)
+            # statistics computed earlier for this very file are reused
+            vol = context.view_layer.objects.active.data
+            if (
+                stats := Load_vdb_statistics(abspath, _active_grid_name(vol))
+            ) is not None:
+                Store_histogram_on_material(mat, stats)
+            else:
+                Clear_histogram_on_material(mat)
 
         self.report({"INFO"}, f"Created Volume from .vdb file: {display_name}")
         return {"FINISHED"}
 
 
+class Volume_ComputeHistogram(bpy.types.Operator):
+    bl_idname = "blend_et.volume_render_compute_histogram"
+    bl_label = "Compute histogram"
+    bl_description = (
+        "Compute the value range and histogram of the active grid of the selected "
+        "volume (cached next to the .vdb file)"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return obj is not None and obj.type == "VOLUME"
+
+    def execute(self, context: bpy.types.Context) -> set[OperatorReturnItems]:
+        vol = context.object.data
+        mat = context.object.active_material
+        if mat is None or mat.get("category", None) != "volume":
+            self.report({"ERROR"}, "The active material is not a volume material.")
+            return {"CANCELLED"}
+
+        # downsampled preview levels do not hold the full distribution
+        levels = vol.get("blend_et_levels") or {}
+        path = bpy.path.abspath(levels.get("1", vol.filepath))
+        if not os.path.isfile(path):
+            self.report({"ERROR"}, f"File not found:\n{path}")
+            return {"CANCELLED"}
+
+        grid_name = _active_grid_name(vol)
+        if (stats := Load_vdb_statistics(path, grid_name)) is None:
+            try:
+                stats = Vdb_statistics(path, grid_name, workers=os.cpu_count() or 1)
+            except Exception as e:
+                self.report({"ERROR"}, f"Failed to read grid '{grid_name}': {e}")
+                return {"CANCELLED"}
+            try:
+                Store_vdb_statistics(path, stats, grid_name)
+            except OSError as e:
+                self.report({"WARNING"}, f"Could not cache the histogram: {e}")
+
+        Store_histogram_on_material(mat, stats)
+        self.report({"INFO"}, f"Value range: [{stats.vmin:.3g}, {stats.vmax:.3g}]")
+        return {"FINISHED"}
+
+
 class Volume_ImportNumpy(bpy.types.Operator):
     bl_idname = "blend_et.volume_render_import_numpy"
     bl_label = "Import .npy/.npz as volume"
     bl_description = (
-        "Load a 3D NumPy array (.npy/.npz) and create a Volume object via OpenVDB"
+        "Load a 3D NumPy array (.npy/.npz) and create a Volume object via OpenVDB "
+        "(runs in the background, Esc to cancel)"
     )
     bl_options = {"REGISTER", "UNDO"}
 
-    def execute(self, context: bpy.types.Context) -> set[OperatorReturnItems]:
-        import os
-
+    def _prepare(self, context: bpy.types.Context) -> bool:
         if (scene := context.scene) is None:
             self.report({"ERROR"}, "No active scene found")
-            return {"CANCELLED"}
+            return False
         props = scene.blend_et_volume_render
 
-        def _compute_histogram_np(arr: np.ndarray, bins: int = 128):
-            """
-            Returns (hist: np.ndarray[int], q05: float, q95: float, vmin: float, vmax: float).
-            Uses full range [min, max] for the histogram, and rough numpy quantiles for 5/95%.
-            Assumes arr is already finite and float.
-            """
-            flat = arr.astype(np.float64, copy=False).ravel()
-            if flat.size == 0:
-                return np.zeros(bins, dtype=np.int32), 0.0, 0.0, 0.0, 1.0
-
-            vmin = float(flat.min())
-            vmax = float(flat.max())
-
-            if vmax == vmin:
-                vmax = vmin + 1e-12
-            cnt, bns = np.histogram(flat, bins=bins, range=(vmin, vmax))
-            bns = 0.5 * (bns[1:] + bns[:-1])
-            cumsum = np.cumsum(cnt)
-            imin = np.argmin(
-                np.abs(cumsum - 0.05 * (cumsum[-1] - cumsum[0]) - cumsum[0])
-            )
-            imax = np.argmin(
-                np.abs(cumsum - 0.95 * (cumsum[-1] - cumsum[0]) - cumsum[0])
-            )
-            q05, q95 = bns[imin], bns[imax]
-            return cnt.astype(np.int32, copy=False), float(q05), float(q95), vmin, vmax
-
         path = bpy.path.abspath(props.numpy_path or "")
         if not path or not os.path.exists(path):
             self.report({"ERROR"}, "Pick a valid .npy /.npz file first.")
-            return {"CANCELLED"}
+            return False
 
         try:
-            try:
-                import pyopenvdb as vdb  # type: ignore
-            except Exception:
-                import openvdb as vdb  # type: ignore
+            Import_openvdb()
         except Exception:
             self.report(
                 {"ERROR"},
                 "pyopenvdb is not installed in Blender's Python. "
                 "Install into Blender's Python and try again.",
             )
-            return {"CANCELLED"}
+            return False
+
+        # the conversion may run on a worker thread, which must not read
+        # the scene properties, so everything it needs is resolved here
+        self._path = path
+        self._vdb_path, self._mip_paths, self._settings = _numpy_cache_paths(
+            props, path
+        )
+        self._max_bytes = _brick_budget(props)
+        xmin, xmax, ymin, ymax, zmin, zmax = self._settings["crop"]
+        self.report(
+            {"INFO"},
+            f"Cropping to Z[{zmin}:{zmax}] Y[{ymin}:{ymax}] X[{xmin}:{xmax}]",
+        )
+        return True
+
+    def _convert(self, progress: Callable[[float], None] | None = None) -> Conversion:
+        return Convert_numpy_to_vdb(
+            self._path,
+            self._vdb_path,
+            mip_paths=self._mip_paths,
+            max_bytes=self._max_bytes,
+            workers=os.cpu_count() or 1,
+            progress=progress,
+            **self._settings,
+        )
 
-        grid = vdb.FloatGrid()
-        grid.name = "density"
+    def _conversion_failed(self, error: Exception) -> set[OperatorReturnItems]:
+        if isinstance(error, ValueError):
+            self.report({"ERROR"}, str(error))
+        else:
+            self.report({"ERROR"}, f"Failed to convert to VDB: {error}")
+        return {"CANCELLED"}
+
+    def _finish(
+        self,
+        context: bpy.types.Context,
+        conversion: Conversion | None = None,
+        stats: Statistics | None = None,
+    ) -> set[OperatorReturnItems]:
+        props = context.scene.blend_et_volume_render
+        vdb_path = self._vdb_path
+        if conversion is not None:
+            histogram, active, skipped = conversion
+            stats = Histogram_statistics(histogram)
+            Store_cached(vdb_path, stats, active_fraction=active)
+            if props.numpy_tiled:
+                self.report({"INFO"}, f"Skipped {skipped} empty bricks")
+            self.report({"INFO"}, f"Active voxels: {100 * active:.1f}%")
+        else:
+            self.report({"INFO"}, f"Reusing cached {os.path.basename(vdb_path)}")
 
-        directory = os.path.dirname(path)
-        ext = os.path.splitext(path)[1].lower()
+        vol_name = _create_numpy_volume(
+            context, props, vdb_path, self._mip_paths, stats
+        )
+        self.report(
+            {"INFO"},
+            f"Imported array as Volume: {vol_name}  (VDB: {os.path.basename(vdb_path)})",
+        )
+        return {"FINISHED"}
 
+    def execute(self, context: bpy.types.Context) -> set[OperatorReturnItems]:
+        if not self._prepare(context):
+            return {"CANCELLED"}
+        props = context.scene.blend_et_volume_render
+        if (
+            stats := _load_cached_volume(props, self._vdb_path, self._mip_paths)
+        ) is not None:
+            return self._finish(context, stats=stats)
         try:
-            if ext == ".npy":
-                arr = np.load(path)
-            elif ext == ".npz":
-                with np.load(path) as data:
-                    z = data
-                    key = props.npz_key.strip()
-                    if not key:
-                        self.report(
-                            {"ERROR"},
-                            f"NPZ datasets: {list(z.files)} — set 'NPZ field'.",
-                        )
-                        return {"CANCELLED"}
-                    if key not in z.files:
-                        self.report(
-                            {"ERROR"}, f"'{key}' not in NPZ datasets: {list(z.files)}"
-                        )
-                        return {"CANCELLED"}
-                    arr = z[key]
-            else:
-                self.report({"ERROR"}, "File must be .npy or .npz")
-                return {"CANCELLED"}
+            conversion = self._convert()
         except Exception as e:
-            self.report({"ERROR"}, f"Failed to load array: {e}")
-            return {"CANCELLED"}
+            return self._conversion_failed(e)
+        return self._finish(context, conversion)
 
-        if arr.ndim == 2:
-            arr = arr[None, ...]  # treat as single slice: Z=1
-        if arr.ndim != 3:
-            self.report({"ERROR"}, f"Array must be 3D (got shape {arr.shape})")
+    def invoke(self, context: bpy.types.Context, event) -> set[OperatorReturnItems]:
+        if not self._prepare(context):
             return {"CANCELLED"}
+        props = context.scene.blend_et_volume_render
+        if (
+            stats := _load_cached_volume(props, self._vdb_path, self._mip_paths)
+        ) is not None:
+            return self._finish(context, stats=stats)
+
+        # the NumPy/openvdb stages run on a worker thread, while the modal
+        # handler keeps the UI responsive and creates the objects at the end
+        self._cancel = threading.Event()
+        self._job = {"progress": 0.0, "result": None, "error": None}
+
+        def _progress(fraction: float) -> None:
+            if self._cancel.is_set():
+                raise _ImportCancelled()
+            self._job["progress"] = fraction
+
+        def _run() -> None:
+            try:
+                self._job["result"] = self._convert(_progress)
+            except Exception as e:
+                self._job["error"] = e
+
+        self._thread = threading.Thread(target=_run, daemon=True)
+        self._thread.start()
+
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def _stop(self, context: bpy.types.Context) -> None:
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+
+    def modal(self, context: bpy.types.Context, event) -> set[OperatorReturnItems]:
+        if event.type == "ESC":
+            # the conversion stops at its next step and removes its files;
+            # the timer keeps polling until it has, so the UI never blocks
+            self._cancel.set()
+            return {"RUNNING_MODAL"}
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+
+        context.window_manager.progress_update(int(100 * self._job["progress"]))
+        if self._thread.is_alive():
+            return {"PASS_THROUGH"}
+        self._stop(context)
+        if self._cancel.is_set():
+            if self._job["result"] is not None:
+                # cancelled after the last checkpoint: the finished files have
+                # no sidecar yet and would never be reused
+                for out_path in (self._vdb_path, *self._mip_paths.values()):
+                    if os.path.exists(out_path):
+                        os.remove(out_path)
+            self.report({"WARNING"}, "Volume import cancelled")
+            return {"CANCELLED"}
+        if (error := self._job["error"]) is not None:
+            return self._conversion_failed(error)
+        return self._finish(context, self._job["result"])
+
+
+class Volume_ImportNumpyBatch(bpy.types.Operator):
+    bl_idname = "blend_et.volume_render_import_numpy_batch"
+    bl_label = "Import files as separate volumes"
+    bl_description = (
+        "Convert many 3D NumPy arrays (.npy/.npz) in parallel worker processes and "
+        "create a Volume object for each as soon as it is ready"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def _start(self, context: bpy.types.Context) -> bool:
+        if (scene := context.scene) is None:
+            self.report({"ERROR"}, "No active scene found")
+            return False
+        props = scene.blend_et_volume_render
+
+        pattern = bpy.path.abspath(props.numpy_sequence_path.strip())
+        if not props.numpy_sequence_path.strip() or not (
+            paths := Sequence_paths(pattern)
+        ):
+            self.report({"ERROR"}, f"No .npy /.npz files found in '{pattern}'.")
+            return False
 
-        # crop
-        zmin = props.numpy_crop_zmin
-        zmax = props.numpy_crop_zmax
-        ymin = props.numpy_crop_ymin
-        ymax = props.numpy_crop_ymax
-        xmin = props.numpy_crop_xmin
-        xmax = props.numpy_crop_xmax
+        try:
+            Import_openvdb()
+        except Exception:
+            self.report(
+                {"ERROR"},
+                "pyopenvdb is not installed in Blender's Python. "
+                "Install into Blender's Python and try again.",
+            )
+            return False
+
+        self._pool = None
+        self._pending = []
+        self._cached = []
+        self._created, self._failed, self._total = 0, 0, len(paths)
+        for path in paths:
+            vdb_path, mip_paths, settings = _numpy_cache_paths(props, path)
+            if (stats := _load_cached_volume(props, vdb_path, mip_paths)) is not None:
+                self._cached.append((vdb_path, mip_paths, stats))
+                continue
+            if self._pool is None:
+                self._pool = WorkerPool(
+                    "volume.conversion", "Convert_frame", props.numpy_workers
+                )
+            future = self._pool.submit(
+                source_path=path,
+                vdb_path=vdb_path,
+                mip_paths=mip_paths,
+                max_bytes=_brick_budget(props),
+                **settings,
+            )
+            self._pending.append((future, path, vdb_path, mip_paths))
+
+        context.window_manager.progress_begin(0, self._total)
+        return True
+
+    def _collect(self, context: bpy.types.Context) -> None:
+        """Creates the volumes of the finished conversions (on the main thread)."""
+        props = context.scene.blend_et_volume_render
+        for vdb_path, mip_paths, stats in self._cached:
+            _create_numpy_volume(context, props, vdb_path, mip_paths, stats)
+            self._created += 1
+        self._cached.clear()
+
+        for job in [job for job in self._pending if job[0].done()]:
+            self._pending.remove(job)
+            future, path, vdb_path, mip_paths = job
+            try:
+                counts, vmin, vmax, _ = future.result()
+            except Exception as e:
+                self.report({"WARNING"}, f"{os.path.basename(path)}: {e}")
+                self._failed += 1
+                continue
+            stats = Histogram_statistics(Histogram(counts, vmin, vmax))
+            Store_cached(vdb_path, stats)
+            _create_numpy_volume(context, props, vdb_path, mip_paths, stats)
+            self._created += 1
+        context.window_manager.progress_update(self._created + self._failed)
+
+    def _finish(self, context: bpy.types.Context, cancel: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel=cancel)
+        # killed workers may leave their temporary files behind, and the
+        # outputs of jobs that were never collected have no sidecar, so they
+        # would never be reused
+        for _, _, vdb_path, mip_paths in self._pending:
+            for out_path in (vdb_path, *mip_paths.values()):
+                for path in (out_path, f"{out_path}.partial"):
+                    if os.path.exists(path):
+                        os.remove(path)
+        if (timer := getattr(self, "_timer", None)) is not None:
+            context.window_manager.event_timer_remove(timer)
+        context.window_manager.progress_end()
         self.report(
-            {"INFO"},
-            f"Cropping to Z[{zmin}:{zmax}] Y[{ymin}:{ymax}] X[{xmin}:{xmax}]",
+            {"WARNING"} if cancel or self._failed else {"INFO"},
+            f"Imported {self._created} of {self._total} arrays as Volumes"
+            + (f" ({self._failed} failed)" if self._failed else "")
+            + (" (cancelled)" if cancel else ""),
         )
-        try:
-            arr = arr[xmin:xmax, ymin:ymax, zmin:zmax]
-        except Exception as e:
-            self.report({"ERROR"}, f"Invalid crop indices: {e}")
+
+    def execute(self, context: bpy.types.Context) -> set[OperatorReturnItems]:
+        if not self._start(context):
+            return {"CANCELLED"}
+        while self._pending:
+            wait([job[0] for job in self._pending], return_when=FIRST_COMPLETED)
+            self._collect(context)
+        self._collect(context)
+        self._finish(context)
+        return {"FINISHED"}
+
+    def invoke(self, context: bpy.types.Context, event) -> set[OperatorReturnItems]:
+        if not self._start(context):
             return {"CANCELLED"}
-        if arr.size == 0:
-            self.report({"ERROR"}, "Cropped array is empty.")
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.2, window=context.window)
+        wm.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context: bpy.types.Context, event) -> set[OperatorReturnItems]:
+        if event.type == "ESC":
+            self._finish(context, cancel=True)
             return {"CANCELLED"}
+        if event.type == "TIMER":
+            self._collect(context)
+            if not self._pending:
+                self._finish(context)
+                return {"FINISHED"}
+        return {"PASS_THROUGH"}
 
-        order_map = {
-            "ZYX": (0, 1, 2),
-            "XYZ": (2, 1, 0),
-            "YZX": (1, 2, 0),
-            "ZXY": (0, 2, 1),
-            "XZY": (2, 0, 1),
-            "YXZ": (1, 0, 2),
-        }
-        axes = order_map.get(props.numpy_axis_order, (0, 1, 2))
-        arr = np.transpose(arr, axes).astype(np.float64, copy=False).T
-        arr = np.nan_to_num(arr, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
 
-        _hist, _q05, _q95, _vmin, _vmax = _compute_histogram_np(arr, bins=128)
+class Volume_ImportNumpySequence(bpy.types.Operator):
+    bl_idname = "blend_et.volume_render_import_numpy_sequence"
+    bl_label = "Import series as volume sequence"
+    bl_description = (
+        "Convert a time series of 3D NumPy arrays (.npy/.npz) in parallel into a "
+        "VDB sequence, played back by a single Volume object"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context: bpy.types.Context) -> set[OperatorReturnItems]:
+        if (scene := context.scene) is None:
+            self.report({"ERROR"}, "No active scene found")
+            return {"CANCELLED"}
+        props = scene.blend_et_volume_render
 
-        arr = np.ascontiguousarray(arr)
-        grid.copyFromArray(arr)
+        pattern = bpy.path.abspath(props.numpy_sequence_path.strip())
+        if not props.numpy_sequence_path.strip() or not (
+            paths := Sequence_paths(pattern)
+        ):
+            self.report({"ERROR"}, f"No .npy /.npz files found in '{pattern}'.")
+            return {"CANCELLED"}
+
+        try:
+            Import_openvdb()
+        except Exception:
+            self.report(
+                {"ERROR"},
+                "pyopenvdb is not installed in Blender's Python. "
+                "Install into Blender's Python and try again.",
+            )
+            return {"CANCELLED"}
 
-        # Output file under same directory in 'BlendET_cache'
+        settings = _conversion_settings(props, paths[0])
         uuid_str = f"{props.uuid:04d}"
         props.uuid += 1
-        blend_dir = (
-            directory if os.path.isabs(path) else os.path.dirname(bpy.data.filepath)
-        )
-        cache_dir = os.path.join(blend_dir, "BlendET_cache")
+        cache_dir = _cache_dir_for(paths[0])
         os.makedirs(cache_dir, exist_ok=True)
-        if ext == ".npz":
-            base = os.path.splitext(os.path.basename(path))[0]
-            if props.npz_key.strip():
-                base += f"_{props.npz_key.strip()}"
+        # frames are numbered by the sequence itself, drop the snapshot number
+        stem = os.path.splitext(os.path.basename(paths[0]))[0]
+        base = re.sub(r"[_\-.]*\d+$", "", stem) or "sequence"
+        if settings["npz_key"]:
+            base += f"_{settings['npz_key']}"
+        key = Cache_key(paths, **settings)
+        seq_dir = os.path.join(cache_dir, f"{base}_{key}")
+        frame_paths = [
+            os.path.join(seq_dir, f"{base}_{i:04d}.vdb")
+            for i in range(1, len(paths) + 1)
+        ]
+
+        stats = Load_cached(seq_dir) if props.use_cache else None
+        if stats is not None and not all(map(os.path.isfile, frame_paths)):
+            stats = None
+        if stats is not None:
+            self.report(
+                {"INFO"}, f"Reusing cached sequence {os.path.basename(seq_dir)}"
+            )
         else:
-            base = os.path.splitext(os.path.basename(path))[0]
-        vdb_path = os.path.join(cache_dir, f"{base}_{uuid_str}.vdb")
-        try:
-            vdb.write(vdb_path, grids=[grid])
-        except Exception as e:
-            self.report({"ERROR"}, f"Failed to write VDB: {e}")
-            return {"CANCELLED"}
+            os.makedirs(seq_dir, exist_ok=True)
+            max_bytes = _brick_budget(props)
+            jobs = [
+                dict(source_path=src, vdb_path=dst, max_bytes=max_bytes, **settings)
+                for src, dst in zip(paths, frame_paths)
+            ]
+            try:
+                results = Run_in_subprocesses(
+                    "volume.conversion", "Convert_frame", jobs, props.numpy_workers
+                )
+            except Exception as e:
+                # never leave a partial sequence to be mixed into a later run
+                shutil.rmtree(seq_dir, ignore_errors=True)
+                self.report({"ERROR"}, f"Failed to convert series: {e}")
+                return {"CANCELLED"}
+
+            # one histogram over all frames keeps the colormap range stable
+            stats = Histogram_statistics(
+                Merge_histograms(Histogram(*r[:3]) for r in results)
+            )
+            active = sum(r[3] for r in results) / len(results)
+            Store_cached(seq_dir, stats, frames=len(paths), active_fraction=active)
+            self.report({"INFO"}, f"Active voxels: {100 * active:.1f}% on average")
 
-        store_path = bpy.path.relpath(vdb_path) if props.save_relative else vdb_path
-        vol_name, _, mat = Create_volume_object(context, store_path, vdb_path, uuid_str)
+        first = frame_paths[0]
+        store_path = bpy.path.relpath(first) if props.save_relative else first
+        vol_name, _, mat = Create_volume_object(context, store_path, first, uuid_str)
+
+        # frames are loaded on demand as the scene frame changes
+        if (vol_obj := context.view_layer.objects.active) is not None:
+            vol_obj.data.is_sequence = True
+            vol_obj.data.frame_start = scene.frame_start
+            vol_obj.data.frame_duration = len(frame_paths)
+            vol_obj.data.frame_offset = 0
 
         if mat is not None:
-            Store_histogram_on_material(mat, _hist, _vmin, _vmax, _q05, _q95)
+            Store_histogram_on_material(mat, stats)
 
         self.report(
             {"INFO"},
-            f"Imported array as Volume: {vol_name}  (VDB: {os.path.basename(vdb_path)})",
+            f"Imported {len(paths)} arrays as Volume sequence: {vol_name}",
+        )
+        return {"FINISHED"}
+
+
+class Volume_PruneCache(bpy.types.Operator):
+    bl_idname = "blend_et.volume_render_prune_cache"
+    bl_label = "Prune cache"
+    bl_description = (
+        "Report the size of the conversion cache next to the selected NumPy file "
+        "and evict the least recently used volumes beyond the size limit"
+    )
+    bl_options = {"REGISTER"}
+
+    clear: bpy.props.BoolProperty(
+        name="Clear",
+        description=(
+            "Remove all cached volumes that are not used in this file, instead "
+            "of pruning to the size limit"
+        ),
+        default=False,
+    )
+
+    def execute(self, context: bpy.types.Context) -> set[OperatorReturnItems]:
+        if (scene := context.scene) is None:
+            self.report({"ERROR"}, "No active scene found")
+            return {"CANCELLED"}
+        props = scene.blend_et_volume_render
+
+        path = bpy.path.abspath(props.numpy_path or "")
+        if not path:
+            self.report({"ERROR"}, "Pick a .npy /.npz file to locate its cache.")
+            return {"CANCELLED"}
+        cache_dir = _cache_dir_for(path)
+
+        count, size = Cache_usage(cache_dir)
+        if self.clear:
+            limit = 0
+        elif props.cache_max_size > 0:
+            limit = props.cache_max_size << 20
+        else:
+            limit = size
+        removed, freed = Prune_cache(cache_dir, limit, keep=_volume_files_in_use())
+
+        self.report(
+            {"INFO"},
+            f"Cache: {count - removed} volumes, {(size - freed) / 2**20:.1f} MB "
+            f"(removed {removed}, freed {freed / 2**20:.1f} MB)",
         )
         return {"FINISHED"}
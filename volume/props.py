@@ -1,7 +1,10 @@
 import bpy
 
 from .utils import (
+    On_histogram_mode_change,
     On_material_colormap_change,
+    On_preview_level_change,
+    On_remap_range_change,
 )
 
 from ..utilities.materials import (
@@ -26,6 +29,23 @@ class Volume_Props(bpy.types.PropertyGroup):
         description="Store .vdb filepath relative to this .blend",
         default=False,
     )
+    use_cache: bpy.props.BoolProperty(
+        name="Reuse cached conversions",
+        description=(
+            "Reuse the .vdb converted earlier from the same file with the same "
+            "dataset, crop and axis order"
+        ),
+        default=True,
+    )
+    cache_max_size: bpy.props.IntProperty(
+        name="Cache limit (MB)",
+        description=(
+            "Prune cache evicts the least recently used volumes from "
+            "'BlendET_cache' beyond this size (0: unlimited)"
+        ),
+        default=0,
+        min=0,
+    )
     numpy_path: bpy.props.StringProperty(
         name=".npy / .npz",
         description="Path to a 3D NumPy array file",
@@ -49,6 +69,63 @@ class Volume_Props(bpy.types.PropertyGroup):
         ],
         default="ZYX",
     )
+    vdb_background: bpy.props.FloatProperty(
+        name="Background",
+        description=(
+            "Value of the empty space: voxels close to it are stored as inactive "
+            "tiles, which shrinks the .vdb and speeds up rendering"
+        ),
+        default=0.0,
+        precision=6,
+    )
+    vdb_tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        description=(
+            "Voxels within this distance of the background value are made inactive"
+        ),
+        default=0.0,
+        min=0.0,
+        precision=6,
+    )
+    numpy_tiled: bpy.props.BoolProperty(
+        name="Out-of-core conversion",
+        description=(
+            "Convert the array brick by brick straight from disk instead of "
+            "loading it into memory (for volumes larger than RAM)"
+        ),
+        default=False,
+    )
+    numpy_brick_budget: bpy.props.IntProperty(
+        name="Brick budget (MB)",
+        description="Maximum size of a brick read at once in out-of-core conversion",
+        default=256,
+        min=8,
+    )
+    numpy_mip_levels: bpy.props.IntProperty(
+        name="Preview levels",
+        description=(
+            "Number of downsampled levels (1/2, 1/4, 1/8) generated for interactive "
+            "preview; renders always use the full resolution"
+        ),
+        default=0,
+        min=0,
+        max=3,
+    )
+    numpy_sequence_path: bpy.props.StringProperty(
+        name="Files",
+        description=(
+            "Directory or glob pattern (e.g. //data/snap_*.npz) of the arrays to "
+            "import at once, ordered by the numbers in their names"
+        ),
+        default="",
+    )
+    numpy_workers: bpy.props.IntProperty(
+        name="Worker processes",
+        description="Number of arrays converted in parallel",
+        default=4,
+        min=1,
+        max=64,
+    )
     numpy_crop_xmin: bpy.props.IntProperty(
         name="X min",
         description="Crop array: minimum X index (inclusive)",
@@ -100,6 +177,10 @@ class VolumeMaterial_Props:
             del bpy.types.Material.volume_hist_image
         if hasattr(bpy.types.Material, "volume_hist_ready"):
             del bpy.types.Material.volume_hist_ready
+        if hasattr(bpy.types.Material, "volume_hist_mode"):
+            del bpy.types.Material.volume_hist_mode
+        if hasattr(bpy.types.Material, "volume_remap_range"):
+            del bpy.types.Material.volume_remap_range
         bpy.types.Material.volume_hist_vmin = bpy.props.FloatProperty(
             name="Min value",
             description="Smallest value of imported NumPy data",
@@ -134,9 +215,38 @@ class VolumeMaterial_Props:
             description="True if histogram comes from NumPy import",
             default=False,
         )
+        bpy.types.Material.volume_hist_mode = bpy.props.EnumProperty(
+            name="Histogram scale",
+            description="How the histogram counts are displayed",
+            items=[
+                ("LINEAR", "Linear", "Counts per bin"),
+                ("LOG", "Log", "Logarithm of the counts per bin"),
+                ("CDF", "Cumulative", "Cumulative distribution of the values"),
+            ],
+            default="LINEAR",
+            update=On_histogram_mode_change,
+        )
+        bpy.types.Material.volume_remap_range = bpy.props.EnumProperty(
+            name="Remap range",
+            description=(
+                "Range of values mapped onto the colormap by the Remap Values node"
+            ),
+            items=[
+                ("MANUAL", "Manual", "Set From Min/Max on the node by hand"),
+                ("MINMAX", "Min/Max", "Full range of the data"),
+                ("Q05_95", "5-95%", "Between the 5% and 95% quantiles"),
+                ("Q01_99", "1-99%", "Between the 1% and 99% quantiles"),
+            ],
+            default="MANUAL",
+            update=On_remap_range_change,
+        )
 
     @staticmethod
     def unregister():
+        if hasattr(bpy.types.Material, "volume_remap_range"):
+            del bpy.types.Material.volume_remap_range
+        if hasattr(bpy.types.Material, "volume_hist_mode"):
+            del bpy.types.Material.volume_hist_mode
         if hasattr(bpy.types.Material, "volume_hist_ready"):
             del bpy.types.Material.volume_hist_ready
         if hasattr(bpy.types.Material, "volume_hist_image"):
@@ -150,3 +260,30 @@ class VolumeMaterial_Props:
         if hasattr(bpy.types.Material, "volume_hist_vmin"):
             del bpy.types.Material.volume_hist_vmin
         CommonMaterial_Props.unregister(category="volume")
+
+
+class VolumeData_Props:
+    @staticmethod
+    def register():
+        if hasattr(bpy.types.Volume, "blend_et_preview_level"):
+            del bpy.types.Volume.blend_et_preview_level
+        bpy.types.Volume.blend_et_preview_level = bpy.props.EnumProperty(
+            name="Preview level",
+            description=(
+                "Resolution shown in the viewport; renders switch to the full "
+                "resolution automatically"
+            ),
+            items=[
+                ("1", "Full", "Full resolution"),
+                ("2", "1/2", "Downsampled 2x"),
+                ("4", "1/4", "Downsampled 4x"),
+                ("8", "1/8", "Downsampled 8x"),
+            ],
+            default="1",
+            update=On_preview_level_change,
+        )
+
+    @staticmethod
+    def unregister():
+        if hasattr(bpy.types.Volume, "blend_et_preview_level"):
+            del bpy.types.Volume.blend_et_preview_level
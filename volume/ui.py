@@ -36,6 +36,10 @@ class BLENDET_PT_volume_material_nde(bpy.types.Panel):
 
         CommonMaterialUI(category="volume", layout=layout, mat=mat)
 
+        if obj.type == "VOLUME":
+            layout.separator()
+            layout.operator("blend_et.volume_render_compute_histogram", icon="GRAPH")
+
         if getattr(mat, "volume_hist_ready", False) and mat.volume_hist_image:
             layout.separator()
             box = layout.box()
@@ -50,8 +54,10 @@ class BLENDET_PT_volume_material_nde(bpy.types.Panel):
             col.row().label(text="5% quantiles")
             col.row().label(text=f"min: {mat.volume_hist_q05:.3g}")
             col.row().label(text=f"max: {mat.volume_hist_q95:.3g}")
+            box.row().prop(mat, "volume_remap_range")
 
             box.row().label(text="Histogram", icon="GRAPH")
+            box.row().prop(mat, "volume_hist_mode", expand=True)
             row = box.row()
             row.ui_units_x = 24
             row.scale_x = 10
@@ -74,6 +80,13 @@ class BLENDET_PT_volume_3dv(bpy.types.Panel):
 
         layout.prop(props, "save_relative")
 
+        if (
+            (obj := context.object) is not None
+            and obj.type == "VOLUME"
+            and obj.data.get("blend_et_levels")
+        ):
+            layout.prop(obj.data, "blend_et_preview_level")
+
         layout.separator()
 
         box = layout.box()
@@ -87,6 +100,15 @@ class BLENDET_PT_volume_3dv(bpy.types.Panel):
         box.row().prop(props, "numpy_path")
         box.row().prop(props, "npz_key")
         box.row().prop(props, "numpy_axis_order")
+        row = box.row(align=True)
+        row.prop(props, "vdb_background")
+        row.prop(props, "vdb_tolerance")
+        box.row().prop(props, "numpy_mip_levels")
+        row = box.row(align=True)
+        row.prop(props, "numpy_tiled")
+        sub = row.row(align=True)
+        sub.enabled = props.numpy_tiled
+        sub.prop(props, "numpy_brick_budget")
         box_crop = box.box()
         box_crop.label(text="Crop indices")
         row = box_crop.row()
@@ -102,3 +124,22 @@ class BLENDET_PT_volume_3dv(bpy.types.Panel):
         split.column().prop(props, "numpy_crop_zmin")
         split.column().prop(props, "numpy_crop_zmax")
         box.row().operator("blend_et.volume_render_import_numpy", icon="IMPORT")
+        box_series = box.box()
+        box_series.label(text="Multiple files (same settings)")
+        box_series.row().prop(props, "numpy_sequence_path")
+        box_series.row().prop(props, "numpy_workers")
+        box_series.row().operator(
+            "blend_et.volume_render_import_numpy_sequence", icon="SEQUENCE"
+        )
+        box_series.row().operator(
+            "blend_et.volume_render_import_numpy_batch", icon="DOCUMENTS"
+        )
+        box_cache = box.box()
+        box_cache.label(text="Conversion cache")
+        box_cache.row().prop(props, "use_cache")
+        box_cache.row().prop(props, "cache_max_size")
+        row = box_cache.row(align=True)
+        row.operator("blend_et.volume_render_prune_cache", icon="TRASH").clear = False
+        row.operator(
+            "blend_et.volume_render_prune_cache", text="Clear", icon="X"
+        ).clear = True
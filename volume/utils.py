@@ -1,4 +1,5 @@
 import bpy
+from bpy.app.handlers import persistent
 
 import numpy as np
 
@@ -12,6 +13,7 @@ from ..utilities.nodes import CreateNodes
 from ..utilities.materials import (
     CommonMaterialColormapChange,
 )
+from ..utilities.stats import Histogram_quantiles, Statistics
 
 
 def Create_or_reset_volume_material(name) -> bpy.types.Material:
@@ -117,56 +119,70 @@ def Create_or_reset_volume_material(name) -> bpy.types.Material:
 
 def Store_histogram_on_material(
     mat: bpy.types.Material,
-    hist: np.ndarray,
-    vmin: float,
-    vmax: float,
-    q05: float,
-    q95: float,
+    stats: Statistics,
     width: int = 256,
     height: int = 256,
 ):
+    hist, vmin, vmax, q05, q95 = stats
+
+    # Store on the material; counts are kept as floats since ID properties
+    # only hold 32-bit integers
+    mat["volume_hist_counts"] = np.asarray(hist, dtype=np.float64).tolist()
+    mat.volume_hist_vmin = float(vmin)
+    mat.volume_hist_vmax = float(vmax)
+    mat.volume_hist_q05 = float(q05)
+    mat.volume_hist_q95 = float(q95)
+
+    Draw_histogram_on_material(mat, width, height)
+    Apply_remap_range(mat)
+
+
+def Draw_histogram_on_material(
+    mat: bpy.types.Material, width: int = 256, height: int = 256
+):
+    """Renders the histogram stored on a material into its preview image,
+    following the material's display mode (linear, log or cumulative)."""
+    if (counts := mat.get("volume_hist_counts")) is None:
+        return
+    hist = np.asarray(counts, dtype=np.float64)
+    vmin, vmax = mat.volume_hist_vmin, mat.volume_hist_vmax
+    q05, q95 = mat.volume_hist_q05, mat.volume_hist_q95
     bins = hist.size
+
+    mode = getattr(mat, "volume_hist_mode", "LINEAR")
+    if mode == "LOG":
+        values = np.log1p(hist)
+    elif mode == "CDF":
+        values = np.cumsum(hist)
+    else:
+        values = hist
+    vmax_value = values.max() if values.size and values.max() > 0 else 1.0
+
+    # normalized heights (0..H-10)
+    heights = np.ceil(values / vmax_value * (height - 10)).astype(np.int32)
+
+    # pixel columns [x0, x1) of every bin, at least 2 px wide to stay visible
+    i = np.arange(bins)
+    x0 = i * width // bins
+    x1 = np.maximum((i + 1) * width // bins, x0 + 1)
+    x1 = np.where(x1 - x0 < 2, np.minimum(x0 + 2, width), x1)
+    # height of every pixel column: the tallest bin covering it
+    n = x1 - x0
+    cols = np.repeat(x0, n) + np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    col_heights = np.zeros(width, dtype=np.int32)
+    np.maximum.at(col_heights, cols, np.repeat(heights, n))
+
     # --- draw pixels ---
     px = np.empty((height, width, 4), dtype=np.float32)
-
     px[..., 0:3] = 0.22
     px[..., 3] = 1.0
+    px[np.arange(height)[:, None] < col_heights[None, :], 0:3] = 0.98
 
-    hmax = int(hist.max()) if hist.size else 1
-    if hmax < 1:
-        hmax = 1
-
-    # normalized heights (0..H-10)
-    heights = np.ceil((hist.astype(np.float32) / float(hmax)) * (height - 10)).astype(
-        np.int32
-    )
-
-    # draw per-bin rectangles with >=2 px width
-    for i in range(bins):
-        x0 = int(i * width / bins)
-        x1 = int((i + 1) * width / bins)
-        if x1 <= x0:
-            x1 = x0 + 1
-        # ensure visible min width
-        if x1 - x0 < 2:
-            x1 = x0 + 2 if x0 + 2 <= width else width
-
-        h = int(heights[i])
-        if h > 0:
-            px[0:h, x0:x1, 0:3] = 0.98
-            px[0:h, x0:x1, 3] = 1.0
-
-    if vmin < q05 < vmax:
-        iq05 = int((q05 - vmin) / (vmax - vmin) * width)
-        px[:, iq05 : min(iq05 + 2, width), 0] = 1.0
-        px[:, iq05 : min(iq05 + 2, width), 1:3] = 0.2
-        px[:, iq05 : min(iq05 + 2, width), 3] = 1.0
-
-    if vmin < q95 < vmax:
-        iq95 = int((q95 - vmin) / (vmax - vmin) * width)
-        px[:, iq95 : min(iq95 + 2, width), 0] = 1.0
-        px[:, iq95 : min(iq95 + 2, width), 1:3] = 0.2
-        px[:, iq95 : min(iq95 + 2, width), 3] = 1.0
+    for q in (q05, q95):
+        if vmin < q < vmax:
+            iq = int((q - vmin) / (vmax - vmin) * width)
+            px[:, iq : min(iq + 2, width), 0] = 1.0
+            px[:, iq : min(iq + 2, width), 1:3] = 0.2
 
     img_name = f"SB_Hist_{mat.name}"
     img = bpy.data.images.get(img_name)
@@ -183,20 +199,52 @@ def Store_histogram_on_material(
         if img.size[0] != width or img.size[1] != height:
             img.scale(width, height)
 
-    setattr(img, "pixels", px.ravel().tolist())
+    img.pixels.foreach_set(px.ravel())
     img.update()
     img.preview_ensure()
 
-    # Store on the material
-    mat.volume_hist_vmin = float(vmin)
-    mat.volume_hist_vmax = float(vmax)
-    mat.volume_hist_q05 = float(q05)
-    mat.volume_hist_q95 = float(q95)
     mat.volume_hist_image = img
     mat.volume_hist_ready = True
 
 
+def Apply_remap_range(mat: bpy.types.Material):
+    """Sets the From Min/Max of the "Remap Values" node to the range selected on
+    the material, using only the statistics stored on it."""
+    mode = getattr(mat, "volume_remap_range", "MANUAL")
+    if mode == "MANUAL" or not getattr(mat, "volume_hist_ready", False):
+        return
+    if not mat.node_tree or (remap := mat.node_tree.nodes.get("RemapValues")) is None:
+        return
+    vmin, vmax = mat.volume_hist_vmin, mat.volume_hist_vmax
+    if mode == "MINMAX":
+        lo, hi = vmin, vmax
+    elif mode == "Q05_95":
+        lo, hi = mat.volume_hist_q05, mat.volume_hist_q95
+    else:
+        counts = np.asarray(mat.get("volume_hist_counts", []), dtype=np.float64)
+        if counts.size == 0:
+            return
+        lo, hi = Histogram_quantiles(counts, vmin, vmax, (0.01, 0.99))
+    if hi <= lo:
+        hi = lo + 1e-12
+    remap.inputs["From Min"].default_value = lo
+    remap.inputs["From Max"].default_value = hi
+
+
+def On_remap_range_change(self, _: bpy.types.Context):
+    """Update callback: self is the Material that owns 'volume_remap_range'."""
+    Apply_remap_range(self)
+
+
+def On_histogram_mode_change(self, _: bpy.types.Context):
+    """Update callback: self is the Material that owns 'volume_hist_mode'."""
+    if getattr(self, "volume_hist_ready", False):
+        Draw_histogram_on_material(self)
+
+
 def Clear_histogram_on_material(mat: bpy.types.Material):
+    if "volume_hist_counts" in mat:
+        del mat["volume_hist_counts"]
     mat.volume_hist_vmin = 0.0
     mat.volume_hist_vmax = 0.0
     mat.volume_hist_q05 = 0.0
@@ -248,3 +296,33 @@ def On_material_colormap_change(self, _: bpy.types.Context):
         create_or_reset_callback=Create_or_reset_volume_material,
         nt=self.node_tree,
     )
+
+
+def Apply_preview_level(vol: bpy.types.Volume, factor: str | None = None):
+    """Points a volume at one of its downsampled levels (``factor``, or the
+    preview level set on it); the full resolution is level "1"."""
+    if not (levels := vol.get("blend_et_levels")):
+        return
+    factor = factor or vol.blend_et_preview_level
+    available = sorted(levels.keys(), key=int)
+    # fall back to the closest level that was generated
+    level = min(available, key=lambda f: abs(int(f) - int(factor)))
+    if vol.filepath != levels[level]:
+        vol.filepath = levels[level]
+
+
+def On_preview_level_change(self, _: bpy.types.Context):
+    """Update callback: self is the Volume that owns 'blend_et_preview_level'."""
+    Apply_preview_level(self)
+
+
+@persistent
+def Use_full_resolution_for_render(*_):
+    for vol in bpy.data.volumes:
+        Apply_preview_level(vol, "1")
+
+
+@persistent
+def Restore_preview_levels(*_):
+    for vol in bpy.data.volumes:
+        Apply_preview_level(vol)